@@ -0,0 +1,103 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+
+from asgiref.wsgi import WsgiToAsgiInstance
+
+
+class ThreadPoolWsgiInstance(WsgiToAsgiInstance):
+    """Один HTTP-запрос: сетевой ввод-вывод в цикле событий, Django в пуле.
+
+    Тело запроса читается асинхронно, представление выполняется в потоке
+    ограниченного пула, а готовый ответ отправляется из цикла событий.
+    Поток занят только на время работы Django и базы данных, поэтому
+    медленные клиенты его не удерживают.
+    """
+
+    def __init__(self, wsgi_application, executor):
+        super().__init__(wsgi_application)
+        self.executor = executor
+
+    async def __call__(self, scope, receive, send):
+        self.scope = scope
+        with SpooledTemporaryFile(max_size=65536) as body:
+            while True:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    return
+                body.write(message.get('body', b''))
+                if not message.get('more_body'):
+                    break
+            body.seek(0)
+            loop = asyncio.get_event_loop()
+            content = await loop.run_in_executor(
+                self.executor, self.run_wsgi, body, loop, send
+            )
+        if content is not None:
+            await send(self.response_start)
+            await send({'type': 'http.response.body', 'body': content})
+
+    def run_wsgi(self, body, loop, send):
+        """Выполняет Django в потоке пула и возвращает тело ответа.
+
+        Потоковые ответы отправляются по частям прямо из потока,
+        тогда возвращается None.
+        """
+        response = self.wsgi_application(
+            self.build_environ(self.scope, body), self.start_response
+        )
+        try:
+            if not getattr(response, 'streaming', False):
+                return b''.join(response)
+            self.send_from_thread(loop, send, self.response_start)
+            for chunk in response:
+                self.send_from_thread(loop, send, {
+                    'type': 'http.response.body', 'body': chunk,
+                    'more_body': True,
+                })
+            self.send_from_thread(loop, send, {'type': 'http.response.body'})
+            return None
+        finally:
+            # Django закрывает соединения с БД по сигналу request_finished.
+            response.close()
+
+    def send_from_thread(self, loop, send, message):
+        asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+
+class ThreadPoolWsgiToAsgi:
+    """ASGI-приложение поверх WSGI-обработчика Django.
+
+    Django 2.2 не поддерживает асинхронные представления и ORM, поэтому
+    синхронный код выполняется в пуле из `max_threads` потоков — по числу
+    допустимых соединений с БД. Запросы сверх пула ждут в цикле событий,
+    не занимая потоков.
+    """
+
+    def __init__(self, wsgi_application, max_threads):
+        self.wsgi_application = wsgi_application
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_threads, thread_name_prefix='django'
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise ValueError(
+                f'Неподдерживаемый тип соединения {scope["type"]}'
+            )
+        await ThreadPoolWsgiInstance(self.wsgi_application, self.executor)(
+            scope, receive, send
+        )
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
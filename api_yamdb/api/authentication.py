@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTTokenUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+
+User = get_user_model()
+
+CLAIMS = ('role', 'is_superuser')
+
+
+def add_claims(token, user):
+    """Добавляет в токен всё, что нужно для проверки прав без БД."""
+    token['username'] = user.username
+    token['role'] = user.role
+    token['is_superuser'] = user.is_superuser
+    return token
+
+
+def get_state_key(user_id):
+    return f'api:auth:{user_id}'
+
+
+def get_user_state(user_id):
+    """Активность, роль и флаг суперпользователя из БД.
+
+    Значение кэшируется в локальной памяти процесса на AUTH_STATE_TIMEOUT
+    секунд: отключение пользователя и смена роли вступают в силу
+    не позже чем через этот интервал.
+    """
+    cache = caches[settings.AUTH_CACHE_ALIAS]
+    key = get_state_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        state = User.objects.filter(pk=user_id).values_list(
+            'is_active', 'role', 'is_superuser'
+        ).first() or (False, None, False)
+        cache.set(key, state, settings.AUTH_STATE_TIMEOUT)
+    return state
+
+
+def forget_user_state(user_id):
+    caches[settings.AUTH_CACHE_ALIAS].delete(get_state_key(user_id))
+
+
+class RoleTokenUser(TokenUser):
+    """Пользователь из токена с ролью для проверки прав."""
+
+    @cached_property
+    def role(self):
+        return self.token.get('role')
+
+    @property
+    def is_admin(self):
+        return self.role == User.ADMIN_ROLE
+
+    @property
+    def is_moderator(self):
+        return self.role == User.MODERATOR_ROLE
+
+
+class StatelessJWTAuthentication(JWTTokenUserAuthentication):
+    """JWT-аутентификация без загрузки пользователя из БД.
+
+    Роль и флаг суперпользователя берутся из токена и сверяются
+    с кэшированным состоянием пользователя: токен отключённого
+    пользователя или выданный до смены роли отклоняется.
+    Токены без этих claims получают их из того же состояния.
+    """
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        is_active, role, is_superuser = get_user_state(user.id)
+        if not is_active:
+            raise AuthenticationFailed(
+                'Пользователь не найден или отключён.', code='user_inactive'
+            )
+        if any(claim not in validated_token for claim in CLAIMS):
+            validated_token['role'] = role
+            validated_token['is_superuser'] = is_superuser
+        elif (user.role, user.is_superuser) != (role, is_superuser):
+            raise AuthenticationFailed(
+                'Права пользователя изменились, получите новый токен.',
+                code='token_revoked'
+            )
+        return user
@@ -0,0 +1,73 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+
+STATS = ('hits', 'misses')
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def _new_generation():
+    return int(time.time() * 1000000)
+
+
+def get_generation(namespace, cache=None):
+    """Возвращает текущее поколение пространства имён кэша.
+
+    Поколение входит в ключ каждого ответа, поэтому инвалидация —
+    это одна операция incr вместо поиска и удаления ключей.
+    Начальное значение берётся из времени, чтобы после вытеснения
+    ключа поколение не совпало со старым.
+    """
+    cache = cache or get_cache()
+    key = f'api:generation:{namespace}'
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, _new_generation(), None)
+        return cache.get(key)
+    return generation
+
+
+def invalidate(*namespaces):
+    cache = get_cache()
+    for namespace in namespaces:
+        key = f'api:generation:{namespace}'
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, _new_generation(), None)
+
+
+def get_response_key(namespace, request):
+    """Ключ ответа: поколение, путь и отсортированные параметры запроса."""
+    query = urlencode(sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+    ))
+    url = request.build_absolute_uri(request.path) + '?' + query
+    digest = hashlib.md5(url.encode()).hexdigest()
+    generation = get_generation(namespace)
+    return f'api:response:{namespace}:{generation}:{digest}'
+
+
+def count(stat, cache=None):
+    cache = cache or get_cache()
+    key = f'api:stats:{stat}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def get_stats():
+    cache = get_cache()
+    return {
+        stat: cache.get(f'api:stats:{stat}') or 0 for stat in STATS
+    }
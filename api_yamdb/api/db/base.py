@@ -0,0 +1,40 @@
+from functools import partial
+
+from django.db.backends.postgresql import base as postgresql
+
+from .. import metrics
+from .pool import get_pool
+
+
+class DatabaseWrapper(postgresql.DatabaseWrapper):
+    """PostgreSQL с пулом соединений процесса.
+
+    Закрытие соединения Django (в конце запроса или по CONN_MAX_AGE)
+    возвращает его в пул. Параметры пула задаются ключом POOL
+    в настройках базы данных.
+    """
+
+    def get_new_connection(self, conn_params):
+        self.pool = get_pool(
+            (self.alias, repr(sorted(conn_params.items()))),
+            partial(postgresql.Database.connect, **conn_params),
+            self.settings_dict.get('POOL', {})
+        )
+        connection, waited = self.pool.getconn()
+        request_metrics = metrics.current.get()
+        if request_metrics is not None:
+            request_metrics.pool_wait = (
+                (request_metrics.pool_wait or 0) + waited
+            )
+        options = self.settings_dict['OPTIONS']
+        self.isolation_level = options.get(
+            'isolation_level', connection.isolation_level
+        )
+        if self.isolation_level != connection.isolation_level:
+            connection.set_session(isolation_level=self.isolation_level)
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.putconn(self.connection)
@@ -0,0 +1,153 @@
+import threading
+from time import monotonic
+
+from psycopg2 import Error, OperationalError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+POOLS = {}
+POOLS_LOCK = threading.Lock()
+
+
+class PoolTimeout(OperationalError):
+    """Свободное соединение не появилось за время ожидания."""
+
+
+class ConnectionPool:
+    """Пул соединений psycopg2 внутри процесса.
+
+    Держит от min_size до max_size соединений. Если все заняты, запрос
+    ждёт освобождения не дольше timeout секунд. Соединение, простоявшее
+    без дела дольше check_interval секунд, перед выдачей проверяется
+    запросом SELECT 1 и при ошибке заменяется новым.
+    """
+
+    def __init__(self, connect, min_size=0, max_size=10, timeout=10,
+                 check_interval=30):
+        self.connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self.condition = threading.Condition()
+        self.idle = []
+        self.size = 0
+        self.waiting = 0
+        self.timeouts = 0
+        for number in range(min_size):
+            self.idle.append((connect(), monotonic()))
+            self.size += 1
+
+    def getconn(self):
+        """Выдаёт соединение и время его ожидания в секундах."""
+        started = monotonic()
+        deadline = started + self.timeout
+        with self.condition:
+            while not self.idle and self.size >= self.max_size:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise PoolTimeout(
+                        f'Нет свободного соединения за {self.timeout} с.'
+                    )
+                self.waiting += 1
+                try:
+                    self.condition.wait(remaining)
+                finally:
+                    self.waiting -= 1
+            if self.idle:
+                connection, returned = self.idle.pop()
+            else:
+                connection, returned = None, None
+                self.size += 1
+        try:
+            if connection is None or not self.check(connection, returned):
+                connection = self.connect()
+        except Exception:
+            self.discard()
+            raise
+        return connection, monotonic() - started
+
+    def check(self, connection, returned):
+        if connection.closed:
+            return False
+        if monotonic() - returned < self.check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        except Error:
+            connection.close()
+            return False
+        return True
+
+    def putconn(self, connection):
+        """Возвращает соединение в пул, откатив незавершённую транзакцию.
+
+        Соединения в пуле хранятся в режиме autocommit.
+        """
+        try:
+            if connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+            connection.autocommit = True
+        except Error:
+            connection.close()
+        if connection.closed:
+            self.discard()
+            return
+        with self.condition:
+            self.idle.append((connection, monotonic()))
+            self.condition.notify()
+
+    def discard(self):
+        with self.condition:
+            self.size -= 1
+            self.condition.notify()
+
+    def close(self):
+        with self.condition:
+            for connection, returned in self.idle:
+                connection.close()
+            self.size -= len(self.idle)
+            self.idle = []
+
+    def get_stats(self):
+        with self.condition:
+            return {
+                'size': self.size,
+                'idle': len(self.idle),
+                'in_use': self.size - len(self.idle),
+                'waiting': self.waiting,
+                'timeouts': self.timeouts,
+            }
+
+
+def get_pool(key, connect, options):
+    """Пул процесса для параметров подключения key."""
+    with POOLS_LOCK:
+        if key not in POOLS:
+            POOLS[key] = ConnectionPool(
+                connect,
+                min_size=options.get('MIN_SIZE', 0),
+                max_size=options.get('MAX_SIZE', 10),
+                timeout=options.get('TIMEOUT', 10),
+                check_interval=options.get('CHECK_INTERVAL', 30),
+            )
+        return POOLS[key]
+
+
+def get_stats():
+    """Суммарное состояние всех пулов процесса."""
+    totals = {}
+    with POOLS_LOCK:
+        pools = list(POOLS.values())
+    for pool in pools:
+        for name, value in pool.get_stats().items():
+            totals[name] = totals.get(name, 0) + value
+    return totals
+
+
+def close_all():
+    with POOLS_LOCK:
+        pools = list(POOLS.values())
+        POOLS.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,98 @@
+import csv
+import io
+from itertools import islice
+
+from django.conf import settings
+from reviews.models import Comment, Review, Title
+
+from .renderers import FastJSONRenderer
+from .serializers import (CommentExportSerializer, ReviewExportSerializer,
+                          TitleValuesSerializer)
+
+# Что выгружается: queryset и сериализатор строк .values().
+EXPORTS = {
+    'titles': (
+        Title.objects.select_related('category'), TitleValuesSerializer
+    ),
+    'reviews': (
+        Review.objects.select_related('author'), ReviewExportSerializer
+    ),
+    'comments': (
+        Comment.objects.select_related('author'), CommentExportSerializer
+    ),
+}
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+# Размер части потока в байтах.
+BUFFER_SIZE = 64 * 1024
+
+
+def iter_items(name, chunk_size=None):
+    """Представления объектов выгрузки `name` в порядке id.
+
+    Строки читаются серверным курсором по chunk_size, связанные
+    данные (жанры) загружаются одним запросом на часть, поэтому
+    память не зависит от размера таблицы.
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    queryset, serializer_class = EXPORTS[name]
+    serializer = serializer_class()
+    rows = serializer.get_queryset(queryset.order_by('id')).iterator(
+        chunk_size=chunk_size
+    )
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield from serializer.to_representation(chunk)
+
+
+def to_csv_value(value):
+    """Вложенные категория и жанры записываются своими slug."""
+    if value is None:
+        return ''
+    if isinstance(value, dict):
+        return value['slug']
+    if isinstance(value, list):
+        return ','.join(item['slug'] for item in value)
+    return value
+
+
+def render_ndjson(items):
+    renderer = FastJSONRenderer()
+    for item in items:
+        yield renderer.render(item) + b'\n'
+
+
+def render_csv(items):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for index, item in enumerate(items):
+        if not index:
+            writer.writerow(item)
+        writer.writerow(to_csv_value(value) for value in item.values())
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+RENDERERS = {'ndjson': render_ndjson, 'csv': render_csv}
+
+
+def stream(name, file_format, chunk_size=None):
+    """Выгрузка частями по BUFFER_SIZE байт."""
+    parts = []
+    size = 0
+    for part in RENDERERS[file_format](iter_items(name, chunk_size)):
+        parts.append(part)
+        size += len(part)
+        if size >= BUFFER_SIZE:
+            yield b''.join(parts)
+            parts = []
+            size = 0
+    if parts:
+        yield b''.join(parts)
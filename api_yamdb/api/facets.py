@@ -0,0 +1,71 @@
+from django.db.models import Count
+from rest_framework.exceptions import ValidationError
+from reviews.models import GenreTitle, Title
+
+from .filters import TitleFilter
+
+
+def get_title_ids(params, exclude=None):
+    """Подзапрос id произведений под фильтрами TitleFilter.
+
+    Фильтр `exclude` не применяется: число произведений в каждом
+    значении фасета считается при остальных фильтрах, чтобы
+    интерфейс мог показать результат выбора другого значения.
+    None — фильтров нет.
+    """
+    data = {
+        key: value for key, value in params.items()
+        if key in TitleFilter.base_filters and key != exclude and value
+    }
+    if not data:
+        return None
+    filterset = TitleFilter(data, queryset=Title.objects.all())
+    if not filterset.is_valid():
+        raise ValidationError(filterset.errors)
+    return filterset.qs.order_by().values('pk')
+
+
+def filter_titles(params, exclude=None):
+    ids = get_title_ids(params, exclude)
+    if ids is None:
+        return Title.objects.all()
+    return Title.objects.filter(pk__in=ids)
+
+
+def get_facets(params):
+    """Число произведений по категориям, жанрам и годам."""
+    categories = filter_titles(params, 'category').filter(
+        category__isnull=False
+    ).values('category__slug', 'category__name').annotate(
+        count=Count('id')
+    ).order_by('category__slug')
+    links = GenreTitle.objects.filter(
+        genre__isnull=False, title__isnull=False
+    )
+    ids = get_title_ids(params, 'genre')
+    if ids is not None:
+        links = links.filter(title__in=ids)
+    genres = links.values('genre__slug', 'genre__name').annotate(
+        count=Count('id')
+    ).order_by('genre__slug')
+    years = filter_titles(params, 'year').values('year').annotate(
+        count=Count('id')
+    ).order_by('year')
+    return {
+        'count': filter_titles(params).count(),
+        'category': [
+            {
+                'name': row['category__name'], 'slug': row['category__slug'],
+                'count': row['count'],
+            }
+            for row in categories
+        ],
+        'genre': [
+            {
+                'name': row['genre__name'], 'slug': row['genre__slug'],
+                'count': row['count'],
+            }
+            for row in genres
+        ],
+        'year': list(years),
+    }
@@ -1,5 +1,8 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, Q
 from django_filters import rest_framework as filters
-from reviews.models import Title
+from reviews.models import SEARCH_CONFIG, Title
 
 
 class TitleFilter(filters.FilterSet):
@@ -7,7 +10,24 @@ class TitleFilter(filters.FilterSet):
     genre = filters.CharFilter(field_name='genre__slug')
     name = filters.CharFilter(field_name='name', lookup_expr='icontains')
     year = filters.NumberFilter(field_name='year')
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('category', 'genre', 'year', 'name')
+        fields = ('category', 'genre', 'year', 'name', 'search')
+
+    def filter_search(self, queryset, name, value):
+        """Полнотекстовый поиск по названию и описанию.
+
+        На PostgreSQL используется GIN-индекс по search_vector,
+        результаты сортируются по релевантности. На остальных базах
+        поиск сводится к icontains без ранжирования.
+        """
+        if connections[queryset.db].vendor != 'postgresql':
+            return queryset.filter(
+                Q(name__icontains=value) | Q(description__icontains=value)
+            )
+        query = SearchQuery(value, config=SEARCH_CONFIG)
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F('search_vector'), query)
+        ).order_by('-search_rank', 'name', 'id')
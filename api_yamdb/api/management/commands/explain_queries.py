@@ -0,0 +1,155 @@
+import re
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from reviews.models import Category, Comment, Genre, Title
+
+# Строки плана, означающие полный просмотр таблицы без индекса.
+SEQ_SCAN_PATTERNS = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'sqlite': re.compile(r'^SCAN (?:TABLE )?(\w+)$'),
+}
+
+
+def get_endpoints():
+    """Возвращает пары (имя, URL) для всех GET-эндпоинтов API.
+
+    Идентификаторы и фильтры берутся из первых записей базы,
+    поэтому команду нужно запускать на заполненных данных.
+    """
+    comment = Comment.objects.select_related('review').order_by('id').first()
+    title = Title.objects.order_by('id').first()
+    category = Category.objects.order_by('id').first()
+    genre = Genre.objects.order_by('id').first()
+    if not all((comment, title, category, genre)):
+        raise CommandError(
+            'В базе нет данных: загрузите их командой load_data.'
+        )
+    review = comment.review
+    titles = '/api/v1/titles/'
+    reviews = f'{titles}{review.title_id}/reviews/'
+    comments = f'{reviews}{review.id}/comments/'
+    word = title.name.split()[0]
+    return [
+        ('categories-list', '/api/v1/categories/'),
+        ('categories-search', f'/api/v1/categories/?search={category.name}'),
+        ('genres-list', '/api/v1/genres/'),
+        ('genres-search', f'/api/v1/genres/?search={genre.name}'),
+        ('titles-list', titles),
+        ('titles-cursor', f'{titles}?pagination=cursor'),
+        ('titles-category', f'{titles}?category={category.slug}'),
+        ('titles-genre', f'{titles}?genre={genre.slug}'),
+        ('titles-year', f'{titles}?year={title.year}'),
+        ('titles-name', f'{titles}?name={word}'),
+        ('titles-search', f'{titles}?search={word}'),
+        ('titles-detail', f'{titles}{title.id}/'),
+        ('reviews-list', reviews),
+        ('reviews-cursor', f'{reviews}?pagination=cursor'),
+        ('reviews-detail', f'{reviews}{review.id}/'),
+        ('comments-list', comments),
+        ('comments-cursor', f'{comments}?pagination=cursor'),
+        ('comments-detail', f'{comments}{comment.id}/'),
+    ]
+
+
+def explain(sql, analyze=False, disable_seqscan=False):
+    """Возвращает план запроса и таблицы, читаемые полным просмотром."""
+    vendor = connection.vendor
+    if vendor == 'postgresql':
+        prefix = 'EXPLAIN ANALYZE ' if analyze else 'EXPLAIN '
+    elif vendor == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    else:
+        raise CommandError(f'EXPLAIN не поддерживается для {vendor}.')
+    with connection.cursor() as cursor:
+        if disable_seqscan and vendor == 'postgresql':
+            cursor.execute('SET enable_seqscan = off')
+        try:
+            cursor.execute(prefix + sql)
+            rows = cursor.fetchall()
+        finally:
+            if disable_seqscan and vendor == 'postgresql':
+                cursor.execute('RESET enable_seqscan')
+    plan = [row[0] if vendor == 'postgresql' else row[-1] for row in rows]
+    pattern = SEQ_SCAN_PATTERNS[vendor]
+    tables = []
+    for line in plan:
+        match = pattern.search(line.strip())
+        if match and match.group(1) not in tables:
+            tables.append(match.group(1))
+    return plan, tables
+
+
+class Command(BaseCommand):
+    help = 'Runs EXPLAIN for queries of every API endpoint and flags seq scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--only', nargs='+', metavar='ENDPOINT',
+            help='Проверить только указанные эндпоинты, например titles-list'
+        )
+        parser.add_argument(
+            '--analyze', action='store_true',
+            help='Выполнять EXPLAIN ANALYZE (только PostgreSQL)'
+        )
+        parser.add_argument(
+            '--disable-seqscan', action='store_true',
+            help='Запретить планировщику полный просмотр (SET enable_seqscan '
+                 '= off): на маленьких данных оставшиеся Seq Scan означают, '
+                 'что подходящего индекса нет (только PostgreSQL)'
+        )
+        parser.add_argument(
+            '--fail-on-seqscan', action='store_true',
+            help='Завершиться с ошибкой, если найден полный просмотр таблицы'
+        )
+
+    def handle(self, *args, **options):
+        endpoints = [
+            (name, url) for name, url in get_endpoints()
+            if not options['only'] or name in options['only']
+        ]
+        flagged = 0
+        for name, url in endpoints:
+            queries = self.capture(url)
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{name}: GET {url} — запросов: {len(queries)}'
+            ))
+            for sql in queries:
+                plan, tables = explain(
+                    sql, options['analyze'], options['disable_seqscan']
+                )
+                if tables:
+                    flagged += 1
+                    self.stdout.write(self.style.WARNING(
+                        f'  Seq Scan ({", ".join(tables)}): {sql[:200]}'
+                    ))
+                elif options['verbosity'] > 1:
+                    self.stdout.write(f'  OK: {sql[:200]}')
+                if options['verbosity'] > 1:
+                    for line in plan:
+                        self.stdout.write(f'      {line}')
+        message = f'Запросов с полным просмотром таблиц: {flagged}'
+        if flagged and options['fail_on_seqscan']:
+            raise CommandError(message)
+        style = self.style.WARNING if flagged else self.style.SUCCESS
+        self.stdout.write(style(message))
+
+    def capture(self, url):
+        """Выполняет GET-запрос в обход кэша ответов и собирает SELECT."""
+        caches = dict(settings.CACHES, explain={
+            'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+        })
+        with override_settings(CACHES=caches, API_CACHE_ALIAS='explain'):
+            with CaptureQueriesContext(connection) as context:
+                response = Client().get(url)
+        if response.status_code != 200:
+            raise CommandError(
+                f'GET {url} вернул код {response.status_code}.'
+            )
+        return [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].lstrip().upper().startswith('SELECT')
+        ]
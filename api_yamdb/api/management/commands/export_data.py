@@ -0,0 +1,45 @@
+from api.export import EXPORTS, RENDERERS, stream
+from django.core.management import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Streams titles, reviews or comments as NDJSON or CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', choices=list(EXPORTS))
+        parser.add_argument(
+            '--format', dest='file_format', choices=list(RENDERERS),
+            default='ndjson', help='Формат выгрузки'
+        )
+        parser.add_argument(
+            '--output', help='Файл для записи (по умолчанию stdout)'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int,
+            help='Количество строк, читаемых из базы за раз'
+        )
+
+    def handle(self, *args, **options):
+        parts = stream(
+            options['name'], options['file_format'], options['chunk_size']
+        )
+        if not options['output']:
+            self.write_stdout(parts)
+            return
+        with open(options['output'], 'wb') as output:
+            for part in parts:
+                output.write(part)
+        self.stderr.write(f'Выгрузка записана в {options["output"]}.')
+
+    def write_stdout(self, parts):
+        """Пишет байты в буфер stdout, а без буфера (StringIO) — текстом.
+
+        Каждая часть выгрузки содержит целые строки и декодируется отдельно.
+        """
+        buffer = getattr(self.stdout, 'buffer', None)
+        for part in parts:
+            if buffer is None:
+                self.stdout.write(part.decode(), ending='')
+            else:
+                buffer.write(part)
+        self.stdout.flush()
@@ -0,0 +1,66 @@
+import time
+
+from api.outbox import deliver_batch, get_stats
+from django.core.management import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Sends queued emails from the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Количество писем, отправляемых через одно соединение'
+        )
+        parser.add_argument(
+            '--max-attempts', type=int, default=5,
+            help='Число попыток, после которого письмо считается '
+                 'неотправленным'
+        )
+        parser.add_argument(
+            '--backoff', type=float, default=30,
+            help='Задержка перед первой повторной попыткой в секундах, '
+                 'удваивается с каждой попыткой'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Работать постоянно, опрашивая очередь'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Пауза между опросами пустой очереди в секундах'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                sent, failed = deliver_batch(
+                    options['batch_size'], options['max_attempts'],
+                    options['backoff']
+                )
+            except Exception as error:
+                # SMTP-сервер недоступен: письма остаются в очереди.
+                self.stderr.write(f'Ошибка отправки: {error}')
+                sent, failed = [], []
+            if sent or failed:
+                self.report(sent, failed)
+            if not options['loop']:
+                break
+            if len(sent) + len(failed) < options['batch_size']:
+                time.sleep(options['interval'])
+
+    def report(self, sent, failed):
+        latencies = sorted(
+            (email.sent_at - email.created).total_seconds()
+            for email in sent
+        )
+        stats = get_stats()
+        self.stdout.write(
+            'Отправлено: {}, ошибок: {}, задержка доставки: медиана {:.1f} с, '
+            'максимум {:.1f} с; в очереди: {}, не отправлено: {}'.format(
+                len(sent), len(failed),
+                latencies[len(latencies) // 2] if latencies else 0,
+                latencies[-1] if latencies else 0,
+                stats['pending'], stats['failed']
+            )
+        )
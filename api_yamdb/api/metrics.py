@@ -0,0 +1,137 @@
+import bisect
+import threading
+from contextvars import ContextVar
+from time import perf_counter
+
+TIME_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Измерения одного запроса: время, запросы к БД и сериализация."""
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+        # Заполняется только бэкендом с пулом соединений (api.db).
+        self.pool_wait = None
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += perf_counter() - started
+            self.db_queries += 1
+
+
+class Histogram:
+    """Гистограмма в формате Prometheus с меткой view.
+
+    Значения хранятся в памяти процесса: каждый воркер gunicorn
+    отдаёт собственные счётчики.
+    """
+
+    def __init__(self, name, description, buckets):
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, view, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            counts, total = self.values.get(
+                view, ([0] * (len(self.buckets) + 1), 0)
+            )
+            counts[index] += 1
+            self.values[view] = (counts, total + value)
+
+    def clear(self):
+        with self.lock:
+            self.values.clear()
+
+    def render(self):
+        lines = [
+            f'# HELP {self.name} {self.description}',
+            f'# TYPE {self.name} histogram',
+        ]
+        with self.lock:
+            values = sorted(
+                (view, list(counts), total)
+                for view, (counts, total) in self.values.items()
+            )
+        for view, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                lines.append(
+                    f'{self.name}_bucket{{view="{view}",le="{bound}"}} '
+                    f'{cumulative}'
+                )
+            lines.append(f'{self.name}_sum{{view="{view}"}} {total}')
+            lines.append(f'{self.name}_count{{view="{view}"}} {cumulative}')
+        return lines
+
+
+HISTOGRAMS = {
+    'duration': Histogram(
+        'yamdb_request_duration_seconds', 'Время обработки запроса',
+        TIME_BUCKETS
+    ),
+    'db_queries': Histogram(
+        'yamdb_db_queries', 'Количество запросов к БД', QUERY_BUCKETS
+    ),
+    'db_time': Histogram(
+        'yamdb_db_duration_seconds', 'Время запросов к БД', TIME_BUCKETS
+    ),
+    'serializer_time': Histogram(
+        'yamdb_serializer_duration_seconds', 'Время сериализации',
+        TIME_BUCKETS
+    ),
+    'pool_wait': Histogram(
+        'yamdb_db_pool_wait_seconds', 'Ожидание соединения из пула',
+        TIME_BUCKETS
+    ),
+    'size': Histogram(
+        'yamdb_response_size_bytes', 'Размер ответа', SIZE_BUCKETS
+    ),
+}
+
+
+def observe(view, values):
+    for name, value in values.items():
+        if value is not None:
+            HISTOGRAMS[name].observe(view, value)
+
+
+def clear():
+    for histogram in HISTOGRAMS.values():
+        histogram.clear()
+
+
+def render(counters=None, gauges=None):
+    """Текст для Prometheus: гистограммы, счётчики и значения {имя: число}.
+
+    Имя может содержать метки: `name{scope="auth"}`.
+    """
+    lines = []
+    for histogram in HISTOGRAMS.values():
+        lines.extend(histogram.render())
+    for kind, values in (('counter', counters), ('gauge', gauges)):
+        typed = set()
+        for name, value in (values or {}).items():
+            base = name.split('{')[0]
+            if base not in typed:
+                typed.add(base)
+                lines.append(f'# TYPE {base} {kind}')
+            lines.append(f'{name} {value}')
+    return '\n'.join(lines) + '\n'
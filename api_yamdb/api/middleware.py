@@ -0,0 +1,67 @@
+import json
+import logging
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+
+from . import metrics
+
+logger = logging.getLogger('api.performance')
+
+
+class PerformanceMiddleware:
+    """Измеряет время запроса, работу с БД, сериализацию и размер ответа.
+
+    Результаты пишутся в лог api.performance одной JSON-строкой,
+    попадают в гистограммы по имени URL (titles-list, reviews-detail)
+    и, если включён SERVER_TIMING, в заголовок Server-Timing.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_metrics = metrics.RequestMetrics()
+        token = metrics.current.set(request_metrics)
+        started = perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(request_metrics.db_wrapper)
+                    )
+                response = self.get_response(request)
+        finally:
+            metrics.current.reset(token)
+        duration = perf_counter() - started
+
+        match = request.resolver_match
+        view = match.url_name if match and match.url_name else 'unmatched'
+        size = None if response.streaming else len(response.content)
+        values = {
+            'duration': duration,
+            'db_queries': request_metrics.db_queries,
+            'db_time': request_metrics.db_time,
+            'serializer_time': request_metrics.serializer_time,
+            'pool_wait': request_metrics.pool_wait,
+            'size': size,
+        }
+        metrics.observe(view, values)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(dict(
+                values, view=view, method=request.method,
+                path=request.path, status=response.status_code,
+            )))
+        if settings.SERVER_TIMING:
+            response['Server-Timing'] = ', '.join((
+                'total;dur={:.2f}'.format(duration * 1000),
+                'db;dur={:.2f};desc="{} queries"'.format(
+                    request_metrics.db_time * 1000, request_metrics.db_queries
+                ),
+                'serializer;dur={:.2f}'.format(
+                    request_metrics.serializer_time * 1000
+                ),
+            ))
+        return response
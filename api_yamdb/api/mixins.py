@@ -1,4 +1,16 @@
-from rest_framework import mixins, viewsets
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from . import cache, replicas
 
 
 class CreateListDeleteViewSet(
@@ -6,3 +18,214 @@ class CreateListDeleteViewSet(
     viewsets.GenericViewSet
 ):
     lookup_field = 'slug'
+
+
+class ParentObjectMixin:
+    """Родительский объект вложенного ресурса из параметров URL.
+
+    Объект загружается один раз за запрос и кэшируется на view:
+    get_queryset, perform_create и расчёт версии используют один запрос.
+    """
+    parent_queryset = None
+    parent_lookups = {}
+
+    def get_parent(self):
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(self.parent_queryset, **{
+                field: self.kwargs[kwarg]
+                for field, kwarg in self.parent_lookups.items()
+            })
+        return self._parent
+
+
+class CachedListMixin:
+    """Отдаёт список из кэша ответов, пока данные не изменились.
+
+    Ключ строится по пути и параметрам запроса, а устаревшие ответы
+    отбрасываются сменой поколения `cache_namespace` из api.signals.
+    Ответ, прочитанный с реплики, может отставать от основной базы,
+    поэтому хранится не дольше REPLICA_PIN_SECONDS.
+    """
+    cache_namespace = None
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            self.cache_namespace, super().list, request, *args, **kwargs
+        )
+
+    def cached_response(self, namespace, handler, request, *args, **kwargs):
+        response_cache = cache.get_cache()
+        key = cache.get_response_key(namespace, request)
+        data = response_cache.get(key)
+        if data is not None:
+            cache.count('hits', response_cache)
+            return Response(data, headers={'X-Cache': 'HIT'})
+        cache.count('misses', response_cache)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            timeout = settings.API_CACHE_TIMEOUT
+            if replicas.current.get() is not None:
+                timeout = min(timeout, settings.REPLICA_PIN_SECONDS)
+            response_cache.set(key, response.data, timeout)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class BulkCreateMixin:
+    """POST bulk/: пакетное создание списка через bulk_creator_class.
+
+    Ответ — результаты элементов в порядке запроса со статусом 201,
+    если созданы все элементы, 207 — если часть, 400 — если ни одного.
+    """
+    bulk_creator_class = None
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request, *args, **kwargs):
+        return self.bulk_create(self.bulk_creator_class)
+
+    def bulk_create(self, creator_class):
+        creator = creator_class(self.request.data)
+        creator.validate()
+        results = creator.save()
+        created = sum(
+            result['status'] == status.HTTP_201_CREATED for result in results
+        )
+        if created == len(results):
+            code = status.HTTP_201_CREATED
+        elif created:
+            code = status.HTTP_207_MULTI_STATUS
+        else:
+            code = status.HTTP_400_BAD_REQUEST
+        return Response(results, status=code)
+
+
+class ValuesListMixin:
+    """Список через values_serializer_class вместо serializer_class.
+
+    Страница выбирается из .values() отфильтрованного queryset,
+    поэтому экземпляры моделей и ModelSerializer не создаются.
+    ?fields= ограничивает ключи ответа и выбираемые поля списка
+    и отдельного объекта, ?expand= разворачивает связи из expandable.
+    """
+    values_serializer_class = None
+    fields_query_param = 'fields'
+    expand_query_param = 'expand'
+
+    def get_query_names(self, param):
+        """Имена из параметра через запятую, пустые пропускаются."""
+        return {
+            name.strip()
+            for name in self.request.query_params.get(param, '').split(',')
+            if name.strip()
+        }
+
+    def get_fieldset(self):
+        """Пара (ключи ответа, развёрнутые связи) из параметров запроса.
+
+        (None, ()) — полное представление: без ?fields= и для записи.
+        """
+        serializer_class = self.values_serializer_class
+        only = self.get_query_names(self.fields_query_param)
+        if (serializer_class is None or not only
+                or self.request.method not in SAFE_METHODS):
+            return None, ()
+        expand = self.get_query_names(self.expand_query_param)
+        errors = {}
+        unknown = only - set(serializer_class.fields)
+        if unknown:
+            errors[self.fields_query_param] = [
+                'Неизвестные поля: {}.'.format(', '.join(sorted(unknown)))
+            ]
+        unknown = expand - set(serializer_class.expandable)
+        if unknown:
+            errors[self.expand_query_param] = [
+                'Нельзя развернуть: {}.'.format(', '.join(sorted(unknown)))
+            ]
+        if errors:
+            raise ValidationError(errors)
+        return only, expand
+
+    def get_serializer_context(self):
+        only, expand = self.get_fieldset()
+        return dict(
+            super().get_serializer_context(), only=only, expand=expand
+        )
+
+    def list(self, request, *args, **kwargs):
+        if self.values_serializer_class is None:
+            return super().list(request, *args, **kwargs)
+        serializer = self.values_serializer_class(*self.get_fieldset())
+        queryset = serializer.get_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                serializer.to_representation(page)
+            )
+        return Response(serializer.to_representation(queryset))
+
+
+class ReplicaReadMixin:
+    """Безопасные запросы читают данные с реплики из api.replicas.
+
+    Реплика выбирается после аутентификации: пользователь, недавно
+    изменявший данные, читает из основной базы. Успешная запись
+    закрепляет его за основной базой на REPLICA_PIN_SECONDS.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        token = replicas.current.set(None)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            replicas.current.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS:
+            replicas.current.set(replicas.choose(request.user.id))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if (request.method not in SAFE_METHODS
+                and response.status_code < 400 and request.user.id):
+            replicas.pin(request.user.id)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ConditionalGetMixin:
+    """Поддержка If-None-Match и If-Modified-Since для list и retrieve.
+
+    Версию данных возвращает get_version: пару (токен, дата изменения)
+    без сериализации ответа. Если версия не изменилась, клиент получает
+    304 Not Modified. None — версии нет, ответ отдаётся без проверки.
+    """
+
+    def get_version(self):
+        return None
+
+    def conditional(self, handler, request, *args, **kwargs):
+        version = self.get_version()
+        if version is None:
+            return handler(request, *args, **kwargs)
+        token, last_modified = version
+        etag = quote_etag(hashlib.md5('{}:{}:{}'.format(
+            token, request.get_full_path(), request.accepted_renderer.format
+        ).encode()).hexdigest())
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(super().retrieve, request, *args, **kwargs)
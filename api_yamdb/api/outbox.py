@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+
+def enqueue(subject, body, from_email, to):
+    """Ставит письмо в очередь; отправляет его команда send_emails.
+
+    Вызывается в транзакции запроса: письмо появится в очереди
+    только вместе с сохранёнными данными.
+    """
+    return OutboxEmail.objects.create(
+        subject=subject, body=body, from_email=from_email, to=to
+    )
+
+
+def get_backoff(attempts, backoff):
+    """Экспоненциальная задержка перед следующей попыткой."""
+    return timedelta(seconds=backoff * 2 ** (attempts - 1))
+
+
+def deliver_batch(batch_size=100, max_attempts=5, backoff=30):
+    """Отправляет пачку писем через одно SMTP-соединение.
+
+    Строки блокируются через SELECT ... FOR UPDATE SKIP LOCKED, поэтому
+    несколько воркеров не отправят одно письмо дважды. Неудачная
+    попытка откладывает письмо с экспоненциальной задержкой, после
+    max_attempts попыток оно помечается как неотправленное.
+    Возвращает отправленные и неудачные письма.
+    """
+    with transaction.atomic():
+        emails = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True).filter(
+                status=OutboxEmail.PENDING,
+                next_attempt_at__lte=timezone.now()
+            ).order_by('id')[:batch_size]
+        )
+        if not emails:
+            return [], []
+        sent, failed = [], []
+        with get_connection() as connection:
+            for email in emails:
+                message = EmailMessage(
+                    email.subject, email.body, email.from_email, [email.to],
+                    connection=connection
+                )
+                try:
+                    message.send()
+                except Exception as error:
+                    schedule_retry(email, error, max_attempts, backoff)
+                    failed.append(email)
+                else:
+                    email.status = OutboxEmail.SENT
+                    email.sent_at = timezone.now()
+                    sent.append(email)
+        OutboxEmail.objects.bulk_update(emails, [
+            'status', 'attempts', 'last_error', 'next_attempt_at', 'sent_at'
+        ])
+    return sent, failed
+
+
+def schedule_retry(email, error, max_attempts, backoff):
+    email.attempts += 1
+    email.last_error = f'{type(error).__name__}: {error}'
+    if email.attempts >= max_attempts:
+        email.status = OutboxEmail.FAILED
+    else:
+        email.next_attempt_at = timezone.now() + get_backoff(
+            email.attempts, backoff
+        )
+
+
+def get_stats():
+    """Глубина очереди и возраст самого старого неотправленного письма."""
+    pending = OutboxEmail.objects.filter(status=OutboxEmail.PENDING)
+    oldest = pending.aggregate(Min('created'))['created__min']
+    return {
+        'pending': pending.count(),
+        'failed': OutboxEmail.objects.filter(
+            status=OutboxEmail.FAILED
+        ).count(),
+        'oldest_pending_seconds': (
+            (timezone.now() - oldest).total_seconds() if oldest else 0
+        ),
+    }
@@ -0,0 +1,95 @@
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.pagination import (BasePagination, CursorPagination,
+                                       PageNumberPagination)
+
+
+class PageSizePagination(PageNumberPagination):
+    """Постраничная пагинация с размером страницы из ?page_size=."""
+    page_size_query_param = 'page_size'
+    max_page_size = settings.MAX_PAGE_SIZE
+
+
+class KeysetPagination(CursorPagination):
+    """Курсорная пагинация по возрастанию id.
+
+    Не выполняет COUNT(*) и OFFSET-сканирование: следующая страница
+    выбирается условием по ключу последней записи. Общее количество
+    записей считается только по явному запросу ?count=true.
+    """
+    ordering = 'id'
+    page_size_query_param = 'page_size'
+    max_page_size = settings.MAX_PAGE_SIZE
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        if request.query_params.get(self.count_query_param) in (
+            '1', 'true', 'True'
+        ):
+            self.count = queryset.count()
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.count is not None:
+            response.data = OrderedDict(
+                [('count', self.count)] + list(response.data.items())
+            )
+        return response
+
+
+class TitleKeysetPagination(KeysetPagination):
+    ordering = ('name', 'id')
+
+
+class OptionalKeysetPagination(BasePagination):
+    """Постраничная пагинация с переходом на курсорную.
+
+    Курсорный режим включается параметром ?pagination=cursor,
+    ссылки next/previous сохраняют его. Без параметра ответ
+    совпадает с обычной постраничной пагинацией.
+    """
+    mode_query_param = 'pagination'
+    mode_cursor = 'cursor'
+    page_number_class = PageSizePagination
+    keyset_class = KeysetPagination
+
+    def __init__(self):
+        self.paginator = self.page_number_class()
+
+    @property
+    def display_page_controls(self):
+        return self.paginator.display_page_controls
+
+    def is_keyset_mode(self, request):
+        return (
+            request.query_params.get(self.mode_query_param)
+            == self.mode_cursor
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_keyset_mode(request):
+            self.paginator = self.keyset_class()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    def get_schema_fields(self, view):
+        return self.paginator.get_schema_fields(view)
+
+    def get_schema_operation_parameters(self, view):
+        return self.paginator.get_schema_operation_parameters(view)
+
+
+class TitlePagination(OptionalKeysetPagination):
+    keyset_class = TitleKeysetPagination
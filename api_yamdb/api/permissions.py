@@ -30,7 +30,7 @@ class IsSuperuserAdminModeratorAuthorOrReadOnly(BasePermission):
     def has_object_permission(self, request, view, obj):
         safe_method = request.method in SAFE_METHODS
         return safe_method or (
-            request.user == obj.author
+            request.user.id == obj.author_id
             or request.user.is_authenticated and (
                 request.user.is_admin or request.user.is_moderator
             ))
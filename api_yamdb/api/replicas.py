@@ -0,0 +1,76 @@
+import random
+from contextvars import ContextVar
+from time import monotonic
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+
+# Реплика для чтения в текущем запросе; None — основная база.
+current = ContextVar('replica_alias', default=None)
+
+# Реплики, к которым не удалось подключиться: {alias: время повтора}.
+unavailable = {}
+
+
+def get_pin_key(user_id):
+    return f'api:replica:pin:{user_id}'
+
+
+def pin(user_id):
+    """Отправляет чтения пользователя в основную базу после его записи.
+
+    Пока реплики догоняют основную базу, пользователь видит
+    собственные изменения. Кэш общий для воркеров (REDIS_URL).
+    """
+    cache.set(get_pin_key(user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user_id):
+    return user_id is not None and cache.get(get_pin_key(user_id)) is not None
+
+
+def is_available(alias):
+    retry_at = unavailable.get(alias)
+    if retry_at is not None and monotonic() < retry_at:
+        return False
+    try:
+        connections[alias].ensure_connection()
+    except DatabaseError:
+        unavailable[alias] = monotonic() + settings.REPLICA_RETRY_SECONDS
+        return False
+    unavailable.pop(alias, None)
+    return True
+
+
+def choose(user_id=None):
+    """Доступная реплика в случайном порядке или None для основной базы."""
+    if not settings.REPLICA_DATABASES or is_pinned(user_id):
+        return None
+    replicas = list(settings.REPLICA_DATABASES)
+    random.shuffle(replicas)
+    for alias in replicas:
+        if is_available(alias):
+            return alias
+    return None
+
+
+class ReplicaRouter:
+    """Чтение из реплики, выбранной для запроса, запись — в default.
+
+    Реплики не мигрируются: они получают схему из основной базы.
+    """
+
+    def db_for_read(self, model, **hints):
+        return current.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db in settings.REPLICA_DATABASES:
+            return False
+        return None
@@ -0,0 +1,44 @@
+from time import perf_counter
+
+from . import metrics
+
+
+class TimedSerializerMixin:
+    """Учитывает время to_representation в метриках запроса.
+
+    Вложенные сериализаторы не измеряются повторно: время считается
+    только для самого внешнего вызова.
+    """
+
+    def to_representation(self, instance):
+        request_metrics = metrics.current.get()
+        if request_metrics is None or request_metrics.serializing:
+            return super().to_representation(instance)
+        request_metrics.serializing = True
+        started = perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            request_metrics.serializer_time += perf_counter() - started
+            request_metrics.serializing = False
+
+
+class FieldsetSerializerMixin:
+    """Ключи ответа из context['only'] (см. ValuesListMixin).
+
+    Связи из compact_fields без context['expand'] заменяются полями
+    со slug, как в ValuesSerializer.
+    """
+    compact_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        only = self.context.get('only')
+        if only is None:
+            return
+        expand = self.context.get('expand', ())
+        for name in list(self.fields):
+            if name not in only:
+                del self.fields[name]
+            elif name in self.compact_fields and name not in expand:
+                self.fields[name] = self.compact_fields[name]()
@@ -1,14 +1,31 @@
+from functools import partial
+from operator import itemgetter
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import connections, router, transaction
 from django.shortcuts import get_object_or_404
-from rest_framework import serializers
+from rest_framework import serializers, status
 from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueTogetherValidator, UniqueValidator
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from reviews.signals import touch_titles
+
+from . import cache
+from .authentication import add_claims
+from .serializer_mixins import FieldsetSerializerMixin, TimedSerializerMixin
+from .signals import NAMESPACES
 
 User = get_user_model()
 
+# Адреса действий категорий и жанров, которые совпали бы с адресом объекта.
+RESERVED_SLUGS = ('bulk',)
+
 
-class CredentialsSerializer(serializers.ModelSerializer):
+class CredentialsSerializer(TimedSerializerMixin,
+                            serializers.ModelSerializer):
     email = serializers.EmailField(required=True)
 
     class Meta:
@@ -33,7 +50,8 @@ class CredentialsSerializer(serializers.ModelSerializer):
         return value
 
 
-class UserRoleSerializer(serializers.ModelSerializer):
+class UserRoleSerializer(TimedSerializerMixin,
+                         serializers.ModelSerializer):
     class Meta:
         model = User
         fields = (
@@ -54,6 +72,10 @@ class UserSerializer(CredentialsSerializer):
 
 class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
 
+    @classmethod
+    def get_token(cls, user):
+        return add_claims(super().get_token(user), user)
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.fields['confirmation_code'] = serializers.CharField(required=True)
@@ -77,19 +99,31 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
         return data
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class SlugSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """Категории и жанры: slug — часть адреса объекта."""
+
+    def validate_slug(self, value):
+        if value in RESERVED_SLUGS:
+            raise serializers.ValidationError(
+                f'Slug "{value}" занят адресом bulk/.'
+            )
+        return value
+
+
+class CategorySerializer(SlugSerializer):
     class Meta:
         fields = ('name', 'slug')
         model = Category
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(SlugSerializer):
     class Meta:
         fields = ('name', 'slug')
         model = Genre
 
 
-class PostTitleSerializer(serializers.ModelSerializer):
+class PostTitleSerializer(TimedSerializerMixin,
+                          serializers.ModelSerializer):
     genre = serializers.SlugRelatedField(
         slug_field='slug', many=True, queryset=Genre.objects.all()
     )
@@ -98,23 +132,37 @@ class PostTitleSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = '__all__'
+        exclude = (
+            'reviews_count', 'score_sum', 'modified', 'search_vector'
+        )
+        read_only_fields = ('rating',)
         model = Title
 
 
-class GetTitleSerializer(serializers.ModelSerializer):
-    rating = serializers.IntegerField(
-        source='reviews__score__avg', read_only=True
-    )
+class GetTitleSerializer(FieldsetSerializerMixin, TimedSerializerMixin,
+                         serializers.ModelSerializer):
+    rating = serializers.IntegerField(read_only=True)
     genre = GenreSerializer(many=True)
     category = CategorySerializer(read_only=True)
+    compact_fields = {
+        'genre': partial(
+            serializers.SlugRelatedField, slug_field='slug', many=True,
+            read_only=True
+        ),
+        'category': partial(
+            serializers.SlugRelatedField, slug_field='slug', read_only=True
+        ),
+    }
 
     class Meta:
-        fields = '__all__'
+        exclude = (
+            'reviews_count', 'score_sum', 'modified', 'search_vector'
+        )
         model = Title
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(FieldsetSerializerMixin, TimedSerializerMixin,
+                       serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         slug_field='username', read_only=True
     )
@@ -123,19 +171,9 @@ class ReviewSerializer(serializers.ModelSerializer):
         model = Review
         exclude = ('title',)
 
-    def validate(self, data):
-        request = self.context.get('request')
-        if request.method == 'POST':
-            title_id = self.context['view'].kwargs.get('title_id'),
-            author = self.context['request'].user
-            if Review.objects.filter(title=title_id, author=author).exists():
-                raise serializers.ValidationError(
-                    'Вы уже оставили отзыв на этот обзор.'
-                )
-        return data
-
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(FieldsetSerializerMixin, TimedSerializerMixin,
+                        serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         slug_field='username', read_only=True
     )
@@ -143,3 +181,399 @@ class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
         exclude = ('review',)
+
+
+class ValuesSerializer:
+    """Представление списка для чтения из строк .values().
+
+    Не создаёт экземпляры моделей и полей сериализатора: `fields`
+    задаёт ключи ответа и соответствующие им поля .values() в том же
+    порядке, что у ModelSerializer. JSON совпадает побайтно. Значение
+    ключа с полем None возвращает метод get_<ключ>.
+
+    `only` ограничивает ключи ответа и выбираемые поля (?fields=),
+    связи из `expandable` без `expand` выводятся своими slug.
+    """
+    fields = {}
+    datetime_fields = ()
+    expandable = ()
+    # Поля .values(), нужные всегда: связи и курсорная пагинация.
+    required = ('id',)
+    datetime = serializers.DateTimeField()
+
+    def __init__(self, only=None, expand=()):
+        self.only = only
+        self.expand = set(expand)
+        self.getters = [
+            (name, self.get_getter(name, path))
+            for name, path in self.fields.items() if self.includes(name)
+        ]
+
+    def includes(self, name):
+        return self.only is None or name in self.only
+
+    def expands(self, name):
+        return self.only is None or name in self.expand
+
+    def get_getter(self, name, path):
+        if path is None:
+            return getattr(self, f'get_{name}')
+        if name in self.datetime_fields:
+            return lambda row: self.to_datetime(row[path])
+        return itemgetter(path)
+
+    def to_datetime(self, value):
+        return None if value is None else self.datetime.to_representation(
+            value
+        )
+
+    def get_paths(self):
+        """Поля .values() для выбранных ключей ответа."""
+        return [
+            path for name, path in self.fields.items()
+            if path is not None and self.includes(name)
+        ]
+
+    def get_queryset(self, queryset):
+        return queryset.values(
+            *dict.fromkeys([*self.required, *self.get_paths()])
+        )
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        self.prepare(rows)
+        return [self.to_item(row) for row in rows]
+
+    def prepare(self, rows):
+        """Загружает связанные данные сразу для всех строк страницы."""
+
+    def to_item(self, row):
+        return {name: getter(row) for name, getter in self.getters}
+
+
+class TitleValuesSerializer(TimedSerializerMixin, ValuesSerializer):
+    """Список GetTitleSerializer: жанры одним запросом на страницу."""
+    fields = {
+        'id': 'id', 'rating': 'rating', 'genre': None, 'category': None,
+        'name': 'name', 'year': 'year', 'description': 'description',
+    }
+    expandable = ('genre', 'category')
+    required = ('id', 'name')
+
+    def get_paths(self):
+        paths = super().get_paths()
+        if self.includes('category'):
+            paths.append('category__slug')
+            if self.expands('category'):
+                paths.append('category__name')
+        return paths
+
+    def prepare(self, rows):
+        if not self.includes('genre'):
+            return
+        self.genres = {row['id']: [] for row in rows}
+        links = GenreTitle.objects.filter(
+            title_id__in=self.genres, genre__isnull=False
+        ).order_by('genre__slug')
+        if not self.expands('genre'):
+            for title_id, slug in links.values_list(
+                'title_id', 'genre__slug'
+            ):
+                self.genres[title_id].append(slug)
+            return
+        for title_id, name, slug in links.values_list(
+            'title_id', 'genre__name', 'genre__slug'
+        ):
+            self.genres[title_id].append({'name': name, 'slug': slug})
+
+    def get_genre(self, row):
+        return self.genres[row['id']]
+
+    def to_item(self, row):
+        if self.only is not None:
+            return super().to_item(row)
+        # Полное представление собирается напрямую: вдвое быстрее getters.
+        return {
+            'id': row['id'],
+            'rating': row['rating'],
+            'genre': self.genres[row['id']],
+            'category': self.get_category(row),
+            'name': row['name'],
+            'year': row['year'],
+            'description': row['description'],
+        }
+
+    def get_category(self, row):
+        slug = row['category__slug']
+        if slug is None or not self.expands('category'):
+            return slug
+        return {'name': row['category__name'], 'slug': slug}
+
+
+class ReviewValuesSerializer(TimedSerializerMixin, ValuesSerializer):
+    """Список ReviewSerializer."""
+    fields = {
+        'id': 'id', 'author': 'author__username', 'text': 'text',
+        'score': 'score', 'pub_date': 'pub_date',
+    }
+    datetime_fields = ('pub_date',)
+
+
+class CommentValuesSerializer(TimedSerializerMixin, ValuesSerializer):
+    """Список CommentSerializer."""
+    fields = {
+        'id': 'id', 'author': 'author__username', 'text': 'text',
+        'pub_date': 'pub_date',
+    }
+    datetime_fields = ('pub_date',)
+
+
+class ReviewExportSerializer(ReviewValuesSerializer):
+    """Отзыв для выгрузки: с id произведения."""
+    fields = {'title': 'title_id', **ReviewValuesSerializer.fields}
+
+
+class CommentExportSerializer(CommentValuesSerializer):
+    """Комментарий для выгрузки: с id отзыва."""
+    fields = {'review': 'review_id', **CommentValuesSerializer.fields}
+
+
+# Сообщения DRF об отсутствующих связанных объектах для пакетной проверки.
+PK_DOES_NOT_EXIST = serializers.PrimaryKeyRelatedField.default_error_messages[
+    'does_not_exist'
+]
+SLUG_DOES_NOT_EXIST = serializers.SlugRelatedField.default_error_messages[
+    'does_not_exist'
+]
+
+
+class BulkCreator:
+    """Пакетное создание объектов из списка элементов.
+
+    Поля элемента проверяет item_serializer_class без запросов к базе,
+    связи и уникальность — check_items, по одному запросу на пакет.
+    Корректные элементы записывает create(items) подкласса в одной
+    транзакции и возвращает их представления в том же порядке; результат
+    возвращается для каждого элемента в порядке запроса. Это не
+    сериализатор DRF: validate() бросает ValidationError только для
+    запроса целиком, ошибки элементов остаются в errors.
+    """
+    model = None
+    item_serializer_class = None
+
+    def __init__(self, data):
+        self.initial_data = data
+
+    def validate(self):
+        data = self.initial_data
+        if not isinstance(data, list) or not data:
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                'Ожидается непустой список объектов.'
+            ]})
+        if len(data) > settings.BULK_MAX_ITEMS:
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                f'Не больше {settings.BULK_MAX_ITEMS} объектов в запросе.'
+            ]})
+        self.items = [None] * len(data)
+        self.errors = [None] * len(data)
+        for index, item in enumerate(data):
+            serializer = self.item_serializer_class(data=item)
+            if serializer.is_valid():
+                self.items[index] = serializer.validated_data
+            else:
+                self.errors[index] = serializer.errors
+        self.check_items()
+
+    def valid_items(self):
+        return [
+            (index, item) for index, item in enumerate(self.items)
+            if item is not None
+        ]
+
+    def add_error(self, index, field, message):
+        self.items[index] = None
+        self.errors[index] = {field: [str(message)]}
+
+    def check_items(self):
+        """Проверяет корректные элементы запросами на весь пакет."""
+
+    def save(self):
+        indexes = [index for index, item in self.valid_items()]
+        results = [
+            {'status': status.HTTP_400_BAD_REQUEST, 'errors': errors}
+            for errors in self.errors
+        ]
+        if not indexes:
+            return results
+        namespaces = NAMESPACES[self.model]
+        with transaction.atomic(using=router.db_for_write(self.model)):
+            created = self.create([self.items[index] for index in indexes])
+            # bulk_create не отправляет сигналы моделей.
+            transaction.on_commit(lambda: cache.invalidate(*namespaces))
+        for index, data in zip(indexes, created):
+            results[index] = {'status': status.HTTP_201_CREATED, 'data': data}
+        return results
+
+
+class SlugBulkCreator(BulkCreator):
+    """Категории и жанры: уникальность slug одним запросом."""
+
+    def check_items(self):
+        valid_items = self.valid_items()
+        existing = set(self.model.objects.filter(
+            slug__in=[item['slug'] for index, item in valid_items]
+        ).values_list('slug', flat=True))
+        for index, item in valid_items:
+            if item['slug'] in existing:
+                self.add_error(index, 'slug', UniqueValidator.message)
+            existing.add(item['slug'])
+
+    def create(self, items):
+        objects = self.model.objects.bulk_create(
+            self.model(**item) for item in items
+        )
+        return [{'name': item.name, 'slug': item.slug} for item in objects]
+
+
+class CategoryItemSerializer(CategorySerializer):
+    class Meta(CategorySerializer.Meta):
+        extra_kwargs = {'slug': {'validators': []}}
+
+
+class GenreItemSerializer(GenreSerializer):
+    class Meta(GenreSerializer.Meta):
+        extra_kwargs = {'slug': {'validators': []}}
+
+
+class CategoryBulkCreator(SlugBulkCreator):
+    model = Category
+    item_serializer_class = CategoryItemSerializer
+
+
+class GenreBulkCreator(SlugBulkCreator):
+    model = Genre
+    item_serializer_class = GenreItemSerializer
+
+
+class TitleItemSerializer(serializers.ModelSerializer):
+    """Поля PostTitleSerializer со slug вместо связанных объектов."""
+    genre = serializers.ListField(child=serializers.SlugField())
+    category = serializers.SlugField()
+
+    class Meta:
+        fields = ('name', 'year', 'description', 'genre', 'category')
+        model = Title
+
+
+class TitleBulkCreator(BulkCreator):
+    """Произведения: категории и жанры всех элементов двумя запросами.
+
+    Ответ для каждого произведения совпадает с элементом списка.
+    """
+    model = Title
+    item_serializer_class = TitleItemSerializer
+
+    def check_items(self):
+        valid_items = self.valid_items()
+        self.categories = dict(Category.objects.filter(slug__in={
+            item['category'] for index, item in valid_items
+        }).values_list('slug', 'id'))
+        self.genres = dict(Genre.objects.filter(slug__in={
+            slug for index, item in valid_items for slug in item['genre']
+        }).values_list('slug', 'id'))
+        for index, item in valid_items:
+            missing = [
+                slug for slug in item['genre'] if slug not in self.genres
+            ]
+            if item['category'] not in self.categories:
+                self.add_error(index, 'category', SLUG_DOES_NOT_EXIST.format(
+                    slug_name='slug', value=item['category']
+                ))
+            elif missing:
+                self.add_error(index, 'genre', SLUG_DOES_NOT_EXIST.format(
+                    slug_name='slug', value=missing[0]
+                ))
+
+    def create(self, items):
+        titles = [
+            Title(
+                name=item['name'], year=item['year'],
+                description=item.get('description'),
+                category_id=self.categories[item['category']],
+            )
+            for item in items
+        ]
+        connection = connections[router.db_for_write(Title)]
+        if connection.features.can_return_ids_from_bulk_insert:
+            Title.objects.bulk_create(titles)
+        else:
+            # Без RETURNING bulk_create не заполняет id для связей.
+            for title in titles:
+                title.save()
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title_id=title.id, genre_id=genre_id)
+            for title, item in zip(titles, items)
+            for genre_id in {self.genres[slug] for slug in item['genre']}
+        )
+        serializer = TitleValuesSerializer()
+        data = {
+            item['id']: item for item in serializer.to_representation(
+                serializer.get_queryset(
+                    Title.objects.filter(pk__in=[title.id for title in titles])
+                )
+            )
+        }
+        return [data[title.id] for title in titles]
+
+
+class GenreLinkSerializer(serializers.Serializer):
+    title = serializers.IntegerField(min_value=1)
+    genre = serializers.SlugField()
+
+
+class GenreLinkBulkCreator(BulkCreator):
+    """Связи произведений с жанрами: проверка тремя запросами."""
+    model = GenreTitle
+    item_serializer_class = GenreLinkSerializer
+
+    def check_items(self):
+        valid_items = self.valid_items()
+        titles = set(Title.objects.filter(pk__in={
+            item['title'] for index, item in valid_items
+        }).values_list('id', flat=True))
+        self.genres = dict(Genre.objects.filter(slug__in={
+            item['genre'] for index, item in valid_items
+        }).values_list('slug', 'id'))
+        existing = set(GenreTitle.objects.filter(
+            title_id__in=titles, genre_id__in=self.genres.values()
+        ).values_list('title_id', 'genre_id'))
+        for index, item in valid_items:
+            link = item['title'], self.genres.get(item['genre'])
+            if item['title'] not in titles:
+                self.add_error(index, 'title', PK_DOES_NOT_EXIST.format(
+                    pk_value=item['title']
+                ))
+            elif link[1] is None:
+                self.add_error(index, 'genre', SLUG_DOES_NOT_EXIST.format(
+                    slug_name='slug', value=item['genre']
+                ))
+            elif link in existing:
+                self.add_error(
+                    index, api_settings.NON_FIELD_ERRORS_KEY,
+                    UniqueTogetherValidator.message.format(
+                        field_names='title, genre'
+                    )
+                )
+            existing.add(link)
+
+    def create(self, items):
+        GenreTitle.objects.bulk_create(
+            GenreTitle(
+                title_id=item['title'], genre_id=self.genres[item['genre']]
+            )
+            for item in items
+        )
+        touch_titles(pk__in={item['title'] for item in items})
+        return [
+            {'title': item['title'], 'genre': item['genre']} for item in items
+        ]
@@ -0,0 +1,40 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from reviews.models import Category, Genre, GenreTitle, Review, Title
+
+from . import cache
+from .authentication import forget_user_state
+
+# Какие кэшированные списки устаревают при изменении модели.
+NAMESPACES = {
+    Category: ('categories', 'titles', 'facets'),
+    Genre: ('genres', 'titles', 'facets'),
+    Title: ('titles', 'facets'),
+    GenreTitle: ('titles', 'facets'),
+    Review: ('titles',),
+}
+
+
+def invalidate_cached_lists(sender, **kwargs):
+    namespaces = NAMESPACES[sender]
+    transaction.on_commit(lambda: cache.invalidate(*namespaces))
+
+
+for model in NAMESPACES:
+    post_save.connect(invalidate_cached_lists, sender=model)
+    post_delete.connect(invalidate_cached_lists, sender=model)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, **kwargs):
+    namespaces = NAMESPACES[GenreTitle]
+    transaction.on_commit(lambda: cache.invalidate(*namespaces))
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def forget_auth_state(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: forget_user_state(user_id))
@@ -0,0 +1,113 @@
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+# Отклонённые запросы процесса по scope для /api/v1/stats/metrics/.
+rejected = Counter()
+rejected_lock = threading.Lock()
+
+
+def get_stats():
+    with rejected_lock:
+        return dict(rejected)
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """Ограничение частоты по скользящему окну из двух счётчиков.
+
+    Вместо истории запросов SimpleRateThrottle хранятся счётчики
+    текущего и предыдущего окна: число запросов за последние
+    `duration` секунд оценивается как текущий счётчик плюс доля
+    предыдущего. На запрос — одно чтение двух ключей и один incr
+    в кэше THROTTLE_CACHE_ALIAS (память процесса или Redis).
+    Частота берётся из DEFAULT_THROTTLE_RATES при каждом запросе,
+    пустое значение отключает ограничение.
+    """
+
+    def __init__(self):
+        self.cache = caches[settings.THROTTLE_CACHE_ALIAS]
+        super().__init__()
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope) or None
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        now = self.timer()
+        window, elapsed = divmod(now, self.duration)
+        current_key = f'{self.key}:{int(window)}'
+        previous_key = f'{self.key}:{int(window) - 1}'
+        counts = self.cache.get_many([previous_key, current_key])
+        previous = counts.get(previous_key, 0)
+        current = counts.get(current_key, 0)
+        weight = 1 - elapsed / self.duration
+        if previous * weight + current >= self.num_requests:
+            self.wait_seconds = self.get_wait(previous, current, elapsed)
+            with rejected_lock:
+                rejected[self.scope] += 1
+            return False
+        if not self.cache.add(current_key, 1, self.duration * 2):
+            try:
+                self.cache.incr(current_key)
+            except ValueError:
+                self.cache.set(current_key, 1, self.duration * 2)
+        return True
+
+    def get_wait(self, previous, current, elapsed):
+        """Секунды, пока оценка не опустится ниже лимита."""
+        if current >= self.num_requests:
+            return self.duration - elapsed
+        return max(
+            0, (1 - (self.num_requests - current) / previous) * self.duration
+            - elapsed
+        )
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class AuthRateThrottle(SlidingWindowThrottle):
+    """Регистрация и выдача токенов по IP клиента."""
+    scope = 'auth'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope, 'ident': self.get_ident(request)
+        }
+
+
+class AnonReadRateThrottle(SlidingWindowThrottle):
+    """Чтение анонимными клиентами по IP."""
+    scope = 'anon_read'
+
+    def get_cache_key(self, request, view):
+        if request.user.is_authenticated or (
+            request.method not in SAFE_METHODS
+        ):
+            return None
+        return self.cache_format % {
+            'scope': self.scope, 'ident': self.get_ident(request)
+        }
+
+
+class UserWriteRateThrottle(SlidingWindowThrottle):
+    """Изменение данных пользователем по id из токена."""
+    scope = 'user_write'
+
+    def get_cache_key(self, request, view):
+        if not request.user.is_authenticated or (
+            request.method in SAFE_METHODS
+        ):
+            return None
+        return self.cache_format % {
+            'scope': self.scope, 'ident': request.user.id
+        }
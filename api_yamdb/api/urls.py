@@ -1,4 +1,6 @@
-from api.views import (CategoryViewSet, CommentViewSet, GenreViewSet,
+from api.throttling import AuthRateThrottle
+from api.views import (CacheStatsView, CategoryViewSet, CommentViewSet,
+                       ExportView, GenreViewSet, MetricsView,
                        MyTokenObtainPairView, ReviewViewSet, SignUpViewSet,
                        TitleViewSet, UsersViewSet)
 from django.urls import include, path
@@ -28,11 +30,14 @@ auth_endpoints = [
     path('signup/',
          SignUpViewSet.as_view({'post': 'create'})),
     path('token/refresh/',
-         TokenRefreshView.as_view(),
+         TokenRefreshView.as_view(throttle_classes=(AuthRateThrottle,)),
          name='token_refresh'),
 ]
 
 urlpatterns = [
     path('v1/', include(router.urls)),
     path('v1/auth/', include(auth_endpoints)),
+    path('v1/stats/cache/', CacheStatsView.as_view(), name='cache_stats'),
+    path('v1/stats/metrics/', MetricsView.as_view(), name='metrics'),
+    path('v1/export/<name>/', ExportView.as_view(), name='export'),
 ]
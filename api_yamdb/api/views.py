@@ -2,26 +2,39 @@ import uuid
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView
 from reviews.models import Category, Genre, Review, Title
 
+from . import export, facets, metrics, outbox, throttling
+from .cache import get_response_key, get_stats
+from .db import pool
 from .filters import TitleFilter
-from .mixins import CreateListDeleteViewSet
+from .mixins import (BulkCreateMixin, CachedListMixin, ConditionalGetMixin,
+                     CreateListDeleteViewSet, ParentObjectMixin,
+                     ReplicaReadMixin, ValuesListMixin)
+from .pagination import OptionalKeysetPagination, TitlePagination
 from .permissions import (IsAdministratorRole, IsAdminOrReadOnly,
                           IsSuperuserAdminModeratorAuthorOrReadOnly)
-from .serializers import (CategorySerializer, CommentSerializer,
-                          CredentialsSerializer, GenreSerializer,
+from .serializers import (CategoryBulkCreator, CategorySerializer,
+                          CommentSerializer, CommentValuesSerializer,
+                          CredentialsSerializer, GenreBulkCreator,
+                          GenreLinkBulkCreator, GenreSerializer,
                           GetTitleSerializer, MyTokenObtainPairSerializer,
                           PostTitleSerializer, ReviewSerializer,
-                          UserRoleSerializer, UserSerializer)
+                          ReviewValuesSerializer, TitleBulkCreator,
+                          TitleValuesSerializer, UserRoleSerializer,
+                          UserSerializer)
 
 User = get_user_model()
 
@@ -29,29 +42,30 @@ User = get_user_model()
 class SignUpViewSet(viewsets.ModelViewSet):
     """Обработка принимает на вход параметры POST запросом:
     email и username, генерирует verification_code,
-    создает пользователя и отправляет
-    код по указаноий в параметре почте.
+    создает пользователя и ставит в очередь письмо
+    с кодом на указанную в параметре почту.
     Данный узел свободен от аутентификации и разрешений.
     """
     queryset = User.objects.all()
     serializer_class = CredentialsSerializer
     permission_classes = ()
     authentication_classes = ()
+    throttle_classes = (throttling.AuthRateThrottle,)
 
     def create(self, request):
         serializer = CredentialsSerializer(data=request.data)
         if serializer.is_valid():
             confirmation_code = uuid.uuid4()
-            serializer.save(confirmation_code=confirmation_code)
-
             mail_text = f'Код подтверждения {confirmation_code}'
             mail_theme = 'Код подтверждения'
             mail_from = settings.MAIL_FROM
-            mail_to = serializer.data['email']
-            send_mail(
-                mail_theme, mail_text, mail_from, [mail_to],
-                fail_silently=False
-            )
+            # Письмо отправляет команда send_emails, а не запрос.
+            with transaction.atomic():
+                serializer.save(confirmation_code=confirmation_code)
+                outbox.enqueue(
+                    mail_theme, mail_text, mail_from,
+                    serializer.data['email']
+                )
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -60,6 +74,7 @@ class MyTokenObtainPairView(TokenObtainPairView):
     """Обработка выдачи токенов."""
     permission_classes = [AllowAny]
     serializer_class = MyTokenObtainPairSerializer
+    throttle_classes = (throttling.AuthRateThrottle,)
 
 
 class UsersViewSet(viewsets.ModelViewSet):
@@ -77,7 +92,7 @@ class UsersViewSet(viewsets.ModelViewSet):
     )
     def me_user(self, request, pk=None):
         """Обработка узла users/me"""
-        user = get_object_or_404(User, username=request.user)
+        user = get_object_or_404(User, pk=request.user.id)
         serializer = UserRoleSerializer(user, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
@@ -85,29 +100,41 @@ class UsersViewSet(viewsets.ModelViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class CategoryViewSet(CreateListDeleteViewSet):
+class CategoryViewSet(ReplicaReadMixin, CachedListMixin, BulkCreateMixin,
+                      CreateListDeleteViewSet):
     """Операции связананные с категориями"""
+    cache_namespace = 'categories'
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    bulk_creator_class = CategoryBulkCreator
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = [filters.SearchFilter]
     search_fields = ('name',)
 
 
-class GenreViewSet(CreateListDeleteViewSet):
+class GenreViewSet(ReplicaReadMixin, CachedListMixin, BulkCreateMixin,
+                   CreateListDeleteViewSet):
     """Операции связананные с жанрами"""
+    cache_namespace = 'genres'
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    bulk_creator_class = GenreBulkCreator
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = [filters.SearchFilter]
     search_fields = ('name',)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(ReplicaReadMixin, ConditionalGetMixin, CachedListMixin,
+                   ValuesListMixin, BulkCreateMixin, viewsets.ModelViewSet):
     """Операции связананные с названиями произведений"""
-    queryset = Title.objects.all().annotate(
-        Avg('reviews__score')).order_by('name')
+    cache_namespace = 'titles'
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre').defer('search_vector').order_by('name')
     permission_classes = (IsAdminOrReadOnly,)
+    pagination_class = TitlePagination
+    values_serializer_class = TitleValuesSerializer
+    bulk_creator_class = TitleBulkCreator
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitleFilter
 
@@ -116,36 +143,219 @@ class TitleViewSet(viewsets.ModelViewSet):
             return PostTitleSerializer
         return GetTitleSerializer
 
+    def get_queryset(self):
+        only, expand = self.get_fieldset()
+        queryset = super().get_queryset()
+        if only is not None and 'description' not in only:
+            queryset = queryset.defer('description')
+        if only is not None and 'genre' not in only:
+            return queryset.prefetch_related(None)
+        return queryset
+
+    def get_version(self):
+        if self.action == 'retrieve':
+            try:
+                modified = Title.objects.filter(
+                    pk=self.kwargs['pk']
+                ).values_list('modified', flat=True).first()
+            except (TypeError, ValueError):
+                # Некорректный pk: retrieve ответит 404 из get_object.
+                return None
+            return modified and (modified.isoformat(), modified)
+        # Поколение кэша меняется при каждой записи, влияющей на списки
+        # (api.signals.NAMESPACES), поэтому ETag списка не требует
+        # запроса к базе. Дата изменения для списка не передаётся.
+        return get_response_key(self.cache_namespace, self.request), None
+
+    @action(detail=False, methods=['post'], url_path='genres/bulk')
+    def genres_bulk(self, request):
+        """Пакетное добавление жанров произведениям."""
+        return self.bulk_create(GenreLinkBulkCreator)
+
+    @action(detail=False)
+    def facets(self, request):
+        """Число произведений по категориям, жанрам и годам.
+
+        Ответ кэшируется для каждой комбинации фильтров и сбрасывается
+        при изменении произведений, их жанров, категорий и жанров.
+        """
+        return self.cached_response(
+            'facets',
+            lambda request: Response(facets.get_facets(request.query_params)),
+            request
+        )
+
+    @action(detail=False)
+    def top(self, request):
+        """Лучшие произведения по взвешенной оценке."""
+        return self.ranked_list('-ranking__score', 'id')
+
+    @action(detail=False)
+    def trending(self, request):
+        """Произведения с наибольшим числом недавних отзывов."""
+        return self.ranked_list(
+            '-ranking__velocity', '-ranking__score', 'id',
+            ranking__velocity__gt=0
+        )
+
+    def ranked_list(self, *ordering, **lookups):
+        """Первые `limit` произведений из таблицы TitleRanking.
+
+        Порядок задаёт индекс рейтингов, поэтому время ответа
+        не зависит от размера каталога. Фильтры — как у списка.
+        """
+        try:
+            limit = int(self.request.query_params['limit'])
+        except (KeyError, ValueError):
+            limit = settings.RANKING_LIMIT
+        limit = max(1, min(limit, settings.MAX_PAGE_SIZE))
+        queryset = self.filter_queryset(
+            Title.objects.filter(ranking__isnull=False, **lookups)
+        ).order_by(*ordering)
+        serializer = TitleValuesSerializer(*self.get_fieldset())
+        return Response(serializer.to_representation(
+            serializer.get_queryset(queryset)[:limit]
+        ))
+
+
+class CacheStatsView(APIView):
+    """Счётчики попаданий и промахов кэша ответов"""
+    permission_classes = (IsAdministratorRole,)
+
+    def get(self, request):
+        return Response(get_stats())
+
+
+class MetricsView(APIView):
+    """Метрики запросов и кэша в текстовом формате Prometheus"""
+    permission_classes = (IsAdministratorRole,)
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    def get(self, request):
+        counters = {
+            f'yamdb_cache_{stat}_total': value
+            for stat, value in get_stats().items()
+        }
+        gauges = {
+            f'yamdb_outbox_{name}': value
+            for name, value in outbox.get_stats().items()
+        }
+        counters.update(
+            (f'yamdb_throttled_requests_total{{scope="{scope}"}}', value)
+            for scope, value in throttling.get_stats().items()
+        )
+        pool_stats = pool.get_stats()
+        if pool_stats:
+            counters['yamdb_db_pool_timeouts_total'] = pool_stats.pop(
+                'timeouts'
+            )
+            gauges.update(
+                (f'yamdb_db_pool_{name}', value)
+                for name, value in pool_stats.items()
+            )
+        return HttpResponse(
+            metrics.render(counters, gauges),
+            content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
+
+
+class ExportView(APIView):
+    """Потоковая выгрузка произведений, отзывов или комментариев.
+
+    Формат задаёт ?file_format=ndjson|csv: параметр format занят
+    выбором рендерера DRF.
+    """
+    permission_classes = (IsAdministratorRole,)
+
+    def perform_content_negotiation(self, request, force=False):
+        # Accept: text/csv не должен приводить к 406.
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, name):
+        if name not in export.EXPORTS:
+            raise Http404
+        file_format = request.query_params.get('file_format', 'ndjson')
+        if file_format not in export.RENDERERS:
+            raise ValidationError({'file_format': [
+                'Допустимые форматы: {}.'.format(
+                    ', '.join(export.RENDERERS)
+                )
+            ]})
+        response = StreamingHttpResponse(
+            export.stream(name, file_format),
+            content_type=export.CONTENT_TYPES[file_format]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{name}.{file_format}"'
+        )
+        return response
+
+
+class TitleVersionMixin(ConditionalGetMixin):
+    """Версия отзывов и комментариев — дата изменения произведения"""
+
+    def get_version(self):
+        modified = self.get_title().modified
+        return modified.isoformat(), modified
+
+
+class ReviewViewSet(ReplicaReadMixin, TitleVersionMixin, ParentObjectMixin,
+                    ValuesListMixin, viewsets.ModelViewSet):
     """Операции связананные с отзывами"""
     serializer_class = ReviewSerializer
+    values_serializer_class = ReviewValuesSerializer
     permission_classes = (IsSuperuserAdminModeratorAuthorOrReadOnly,)
+    pagination_class = OptionalKeysetPagination
+    parent_queryset = Title.objects.defer('search_vector')
+    parent_lookups = {'id': 'title_id'}
+
+    def get_title(self):
+        return self.get_parent()
 
     def get_queryset(self):
-        title_id = self.kwargs.get('title_id')
-        title_obj = get_object_or_404(Title, id=title_id)
-        return title_obj.reviews.all()
+        return self.get_parent().reviews.select_related('author')
 
     def perform_create(self, serializer):
-        title_id = self.kwargs.get('title_id')
-        title_obj = get_object_or_404(Title, id=title_id)
-        serializer.save(author=self.request.user, title=title_obj)
+        # Повторный отзыв отсекает ограничение unique_review_author,
+        # а не отдельный запрос на существование. Наличие отзыва
+        # проверяется только после ошибки: остальные нарушения
+        # целостности пробрасываются дальше.
+        title = self.get_parent()
+        author_id = self.request.user.id
+        try:
+            with transaction.atomic():
+                serializer.save(author_id=author_id, title=title)
+        except IntegrityError:
+            if not Review.objects.filter(
+                title=title, author_id=author_id
+            ).exists():
+                raise
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Вы уже оставили отзыв на этот обзор.'
+                ]
+            })
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ReplicaReadMixin, TitleVersionMixin,
+                     ParentObjectMixin, ValuesListMixin,
+                     viewsets.ModelViewSet):
     """Операции связананные с комменатриями"""
     serializer_class = CommentSerializer
+    values_serializer_class = CommentValuesSerializer
     permission_classes = (IsSuperuserAdminModeratorAuthorOrReadOnly,)
+    pagination_class = OptionalKeysetPagination
+    parent_queryset = Review.objects.select_related('title').defer(
+        'title__search_vector'
+    )
+    parent_lookups = {'id': 'review_id', 'title': 'title_id'}
+
+    def get_title(self):
+        return self.get_parent().title
 
     def get_queryset(self):
-        title_id = self.kwargs.get('title_id')
-        review_id = self.kwargs.get('review_id')
-        review_obj = get_object_or_404(Review, id=review_id, title=title_id)
-        return review_obj.comments.all()
+        return self.get_parent().comments.select_related('author')
 
     def perform_create(self, serializer):
-        title_id = self.kwargs.get('title_id')
-        review_id = self.kwargs.get('review_id')
-        review_obj = get_object_or_404(Review, id=review_id, title=title_id)
-        serializer.save(author=self.request.user, review=review_obj)
+        serializer.save(
+            author_id=self.request.user.id, review=self.get_parent()
+        )
@@ -1,7 +1,13 @@
 import os
 
-from django.core.asgi import get_asgi_application
+from api.asgi import ThreadPoolWsgiToAsgi
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+# Django 2.2 не содержит django.core.asgi: WSGI-обработчик выполняется
+# в ограниченном пуле потоков, а сетевой ввод-вывод — в цикле событий.
+application = ThreadPoolWsgiToAsgi(
+    get_wsgi_application(), settings.ASGI_WORKER_THREADS
+)
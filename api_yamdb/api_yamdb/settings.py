@@ -1,6 +1,8 @@
 import os
 from datetime import timedelta
 
+from django.core.exceptions import ImproperlyConfigured
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 SECRET_KEY = os.getenv('SECRET_KEY', 'p&l%385148kslhtyn^##a1)ilz@4zqj=rq&agdol^##zgl9(vs')
@@ -19,11 +21,12 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework_simplejwt',
     'django_filters',
-    'reviews',
-    'api',
+    'reviews.apps.ReviewsConfig',
+    'api.apps.ApiConfig',
 ]
 
 MIDDLEWARE = [
+    'api.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -61,10 +64,97 @@ DATABASES = {
         'USER': os.getenv('POSTGRES_USER', 'postgres'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', 'postgres'),
         'HOST': os.getenv('DB_HOST', 'db'),
-        'PORT': os.getenv('DB_PORT', '5432')
+        'PORT': os.getenv('DB_PORT', '5432'),
+        'CONN_MAX_AGE': int(os.getenv('CONN_MAX_AGE', 0)),
     }
 }
 
+# Пул соединений процесса: соединение берётся из пула на время запроса.
+if (os.getenv('DB_POOL', 'False') == 'True'
+        and DATABASES['default']['ENGINE'].endswith('postgresql')):
+    DATABASES['default']['ENGINE'] = 'api.db'
+    DATABASES['default']['POOL'] = {
+        'MIN_SIZE': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+        'MAX_SIZE': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+        'TIMEOUT': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+        'CHECK_INTERVAL': float(os.getenv('DB_POOL_CHECK_INTERVAL', 30)),
+    }
+
+# Реплики для чтения: HOST[:PORT] для PostgreSQL или путь к файлу SQLite,
+# остальные параметры берутся из default.
+REPLICA_DATABASES = []
+for number, replica in enumerate(filter(None, os.getenv(
+        'DB_REPLICAS', '').split(',')), 1):
+    alias = f'replica{number}'
+    if DATABASES['default']['ENGINE'].endswith('sqlite3'):
+        location = {'NAME': replica}
+    else:
+        host, _, port = replica.partition(':')
+        location = {'HOST': host, 'PORT': port or DATABASES['default']['PORT']}
+    DATABASES[alias] = dict(
+        DATABASES['default'], **location, TEST={'MIRROR': 'default'}
+    )
+    REPLICA_DATABASES.append(alias)
+
+DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+# Сколько секунд после записи пользователь читает из основной базы.
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 5))
+# Через сколько секунд повторить подключение к недоступной реплике.
+REPLICA_RETRY_SECONDS = int(os.getenv('REPLICA_RETRY_SECONDS', 30))
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'yamdb',
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', 1000)),
+        },
+    },
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'yamdb-local',
+    },
+}
+
+if os.getenv('REDIS_URL'):
+    CACHES['default'] = {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': os.getenv('REDIS_URL'),
+    }
+elif REPLICA_DATABASES:
+    # Закрепление за основной базой хранится в кэше: в памяти процесса
+    # его не видят другие воркеры, и пользователь читает устаревшую реплику.
+    raise ImproperlyConfigured('DB_REPLICAS требует общий кэш: задайте REDIS_URL')
+
+API_CACHE_ALIAS = 'default'
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', 300))
+
+# Потоки для выполнения Django под ASGI (uvicorn): не больше,
+# чем допустимо соединений с БД на один процесс.
+ASGI_WORKER_THREADS = int(os.getenv('ASGI_WORKER_THREADS', 10))
+
+AUTH_CACHE_ALIAS = 'local'
+AUTH_STATE_TIMEOUT = int(os.getenv('AUTH_STATE_TIMEOUT', 60))
+
+SERVER_TIMING = os.getenv('SERVER_TIMING', 'False') == 'True'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'api.performance': {
+            'handlers': ['console'],
+            'level': os.getenv('PERFORMANCE_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -101,12 +191,53 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.PageSizePagination',
     'PAGE_SIZE': 5,
+    'DEFAULT_THROTTLE_CLASSES': [
+        'api.throttling.AnonReadRateThrottle',
+        'api.throttling.UserWriteRateThrottle',
+    ],
+    # Пустое значение отключает ограничение.
+    'DEFAULT_THROTTLE_RATES': {
+        'auth': os.getenv('THROTTLE_AUTH_RATE', '20/min'),
+        'anon_read': os.getenv('THROTTLE_ANON_READ_RATE', '600/min'),
+        'user_write': os.getenv('THROTTLE_USER_WRITE_RATE', '120/min'),
+    },
+    # Число прокси перед приложением (nginx) для определения IP клиента.
+    # 0 — IP клиента из REMOTE_ADDR, заголовок X-Forwarded-For не читается.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
 }
 
+# Счётчики ограничения частоты: общий кэш, чтобы лимит действовал
+# на все процессы при настроенном REDIS_URL.
+THROTTLE_CACHE_ALIAS = 'default'
+
+MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', 100))
+
+# Наибольшее число объектов в одном запросе к эндпоинтам bulk/.
+BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', 1000))
+
+# Число строк, читаемых серверным курсором за раз при выгрузке.
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 2000))
+
+# Рейтинги titles/top/ и titles/trending/ (команда refresh_rankings):
+# число «средних» отзывов, добавляемых к оценке произведения,
+# и окно в днях, за которое считается число новых отзывов.
+RANKING_PRIOR_REVIEWS = int(os.getenv('RANKING_PRIOR_REVIEWS', 10))
+TRENDING_DAYS = int(os.getenv('TRENDING_DAYS', 7))
+RANKING_LIMIT = 10
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 AUTH_USER_MODEL = 'reviews.User'
@@ -134,7 +265,7 @@ SIMPLE_JWT = {
 
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
-    'TOKEN_USER_CLASS': 'rest_framework_simplejwt.models.TokenUser',
+    'TOKEN_USER_CLASS': 'api.authentication.RoleTokenUser',
 
     'JTI_CLAIM': 'jti',
 
@@ -1,8 +1,24 @@
-from csv import DictReader
+import csv
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 
-from django.core.management import BaseCommand
+import django
+from api.cache import invalidate
+from api.signals import NAMESPACES
+from django.apps import apps
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, connections, models, transaction
 from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
                             Title, User)
+from reviews.rankings import refresh_rankings
+from reviews.ratings import rebuild_ratings
+
+DATA_DIR = os.path.join(settings.BASE_DIR, 'static', 'data')
 
 CSV_MODELS = [
     [User, 'users.csv'],
@@ -14,19 +30,377 @@ CSV_MODELS = [
     [Comment, 'comments.csv'],
 ]
 
+MODEL_NAMES = [model._meta.model_name for model, file in CSV_MODELS]
+
+COPY_NULL = '\\N'
+
+
+def get_columns(model, header):
+    """Сопоставляет колонки CSV с полями модели.
+
+    Внешние ключи пишутся напрямую в `<поле>_id`, без запросов
+    к связанным таблицам.
+    """
+    columns = []
+    for column in header:
+        field = model._meta.get_field(column)
+        columns.append((column, field.attname, field.null))
+    return columns
+
+
+def read_batches(model, path, batch_size):
+    with open(path, mode='r', encoding='utf-8', newline='') as file:
+        reader = csv.DictReader(file)
+        columns = get_columns(model, reader.fieldnames)
+        while True:
+            batch = [
+                model(**{
+                    attname: (
+                        None if null and row[column] == '' else row[column]
+                    )
+                    for column, attname, null in columns
+                })
+                for row in islice(reader, batch_size)
+            ]
+            if not batch:
+                return
+            yield batch
+
+
+def get_dependents(models):
+    """Возвращает модели, которые каскадно зависят от указанных."""
+    result = list(models)
+    for model, file in CSV_MODELS:
+        if model in result:
+            continue
+        if any(
+            field.is_relation and field.many_to_one
+            and field.related_model in result
+            for field in model._meta.get_fields()
+        ):
+            result.append(model)
+    return result
+
+
+def get_stages(models):
+    """Группирует модели по уровням зависимостей.
+
+    Модели одного уровня не ссылаются друг на друга
+    и могут загружаться параллельно.
+    """
+    levels = {}
+    for model, file in CSV_MODELS:
+        levels[model] = 1 + max(
+            [
+                levels[field.related_model]
+                for field in model._meta.concrete_fields
+                if field.is_relation and field.related_model in levels
+            ],
+            default=-1
+        )
+    stages = {}
+    for model, file in models:
+        stages.setdefault(levels[model], []).append([model, file])
+    return [stages[level] for level in sorted(stages)]
+
+
+def to_copy_value(value):
+    if value is None:
+        return COPY_NULL
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def get_copy_columns(model, header):
+    """Описывает колонки COPY: индекс колонки CSV или значение по умолчанию.
+
+    Поля, которых нет в CSV, заполняются значениями по умолчанию
+    модели: в отличие от bulk_create, COPY их не подставляет.
+    """
+    indexes = {
+        model._meta.get_field(column).attname: index
+        for index, column in enumerate(header)
+    }
+    instance = model()
+    columns = []
+    for field in model._meta.concrete_fields:
+        if field.attname in indexes:
+            columns.append(
+                (field.column, indexes[field.attname], field.null, None)
+            )
+        elif not isinstance(field, models.AutoField):
+            columns.append((
+                field.column, None, field.null,
+                to_copy_value(field.pre_save(instance, add=True))
+            ))
+    return columns
+
+
+def copy_batches(model, path, batch_size):
+    """Перекладывает CSV пачками в формат COPY ... WITH (FORMAT csv)."""
+    with open(path, mode='r', encoding='utf-8', newline='') as file:
+        rows = csv.reader(file)
+        columns = get_copy_columns(model, next(rows))
+        names = [column for column, index, null, default in columns]
+        while True:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            count = 0
+            for row in islice(rows, batch_size):
+                writer.writerow([
+                    default if index is None
+                    else COPY_NULL if null and row[index] == ''
+                    else row[index]
+                    for column, index, null, default in columns
+                ])
+                count += 1
+            if not count:
+                return
+            buffer.seek(0)
+            yield names, buffer, count
+
+
+def copy_model(model, path, batch_size, ignore_conflicts, progress=None):
+    """Загружает CSV через COPY FROM STDIN (только PostgreSQL).
+
+    Если в таблице уже могут быть строки, данные сначала попадают
+    во временную таблицу и переносятся через ON CONFLICT DO NOTHING.
+    """
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    target = table
+    total = 0
+    with connection.cursor() as cursor:
+        if ignore_conflicts:
+            target = quote(f'tmp_{model._meta.db_table}')
+            cursor.execute(
+                f'CREATE TEMPORARY TABLE {target} '
+                f'(LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP'
+            )
+        for names, buffer, count in copy_batches(model, path, batch_size):
+            columns = ', '.join(quote(name) for name in names)
+            cursor.copy_expert(
+                f'COPY {target} ({columns}) FROM STDIN '
+                f"WITH (FORMAT csv, NULL '{COPY_NULL}')",
+                buffer
+            )
+            total += count
+            if progress:
+                progress(model, total)
+        if ignore_conflicts and total:
+            cursor.execute(
+                f'INSERT INTO {table} ({columns}) '
+                f'SELECT {columns} FROM {target} ON CONFLICT DO NOTHING'
+            )
+    return total
+
+
+def bulk_model(model, path, batch_size, ignore_conflicts, progress=None):
+    total = 0
+    for batch in read_batches(model, path, batch_size):
+        model.objects.bulk_create(batch, ignore_conflicts=ignore_conflicts)
+        total += len(batch)
+        if progress:
+            progress(model, total)
+    return total
+
+
+def drop_indexes(model):
+    """Удаляет вторичные индексы таблицы и возвращает их определения.
+
+    Индексы первичного ключа и уникальности остаются: по ним
+    проверяются данные во время загрузки.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT i.relname, pg_get_indexdef(i.oid) FROM pg_index x '
+            'JOIN pg_class i ON i.oid = x.indexrelid '
+            'WHERE x.indrelid = %s::regclass '
+            'AND NOT x.indisprimary AND NOT x.indisunique',
+            [model._meta.db_table]
+        )
+        indexes = cursor.fetchall()
+        for name, definition in indexes:
+            cursor.execute(f'DROP INDEX {connection.ops.quote_name(name)}')
+    return [definition for name, definition in indexes]
+
+
+def restore_indexes(definitions):
+    if not definitions:
+        return
+    with connection.cursor() as cursor:
+        # Отложенные проверки внешних ключей выполняются до CREATE INDEX:
+        # PostgreSQL не строит индексы при ожидающих триггерах.
+        cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        for definition in definitions:
+            cursor.execute(definition)
+
+
+def load_model(model, path, options, progress=None):
+    """Загружает один CSV в одной транзакции.
+
+    На PostgreSQL используется COPY, на остальных базах — bulk_create.
+    Возвращает количество строк и время загрузки.
+    """
+    started = time.monotonic()
+    postgresql = connection.vendor == 'postgresql'
+    loader = copy_model if postgresql else bulk_model
+    with transaction.atomic():
+        definitions = []
+        if postgresql:
+            with connection.cursor() as cursor:
+                cursor.execute('SET CONSTRAINTS ALL DEFERRED')
+            if options['defer_indexes']:
+                definitions = drop_indexes(model)
+        total = loader(
+            model, path, options['batch_size'],
+            ignore_conflicts=not options['truncate'], progress=progress
+        )
+        restore_indexes(definitions)
+    return total, time.monotonic() - started
+
+
+def init_worker():
+    django.setup()
+
+
+def load_model_in_worker(label, path, options):
+    try:
+        return load_model(apps.get_model(label), path, options)
+    finally:
+        connections.close_all()
+
 
 class Command(BaseCommand):
     help = "Loads data from static/data/*.csv files"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default=DATA_DIR,
+            help='Каталог с CSV-файлами (по умолчанию static/data)'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Количество строк в одном INSERT или COPY'
+        )
+        parser.add_argument(
+            '--truncate', action='store_true',
+            help='Очистить таблицы (и зависящие от них) перед загрузкой'
+        )
+        parser.add_argument(
+            '--only', nargs='+', choices=MODEL_NAMES, metavar='MODEL',
+            help=f'Загрузить только указанные модели: {", ".join(MODEL_NAMES)}'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Число процессов для параллельной загрузки независимых '
+                 'таблиц (только PostgreSQL)'
+        )
+        parser.add_argument(
+            '--defer-indexes', action='store_true',
+            help='Удалить вторичные индексы на время загрузки и построить '
+                 'их заново (только PostgreSQL, для больших объёмов)'
+        )
+
     def handle(self, *args, **options):
-        self.stdout.write('Удаляем старые данные...')
-        for model, file in CSV_MODELS:
-            model.objects.all().delete()
+        models = [
+            [model, file] for model, file in CSV_MODELS
+            if not options['only']
+            or model._meta.model_name in options['only']
+        ]
+        if options['truncate']:
+            self.check_truncate(models)
+            self.truncate([model for model, file in models])
+
         self.stdout.write(self.style.NOTICE('Заполняем базу данных...'))
+        parallel = (
+            connection.vendor == 'postgresql' and options['workers'] > 1
+        )
+        for stage in get_stages(models):
+            if parallel and len(stage) > 1:
+                self.load_parallel(stage, options)
+            else:
+                self.load_sequential(stage, options)
+        self.reset_sequences([model for model, file in models])
 
-        for model, file in CSV_MODELS:
-            for row in DictReader(
-                open('static/data/' + file, mode='r', encoding='utf-8')
-            ):
-                model.objects.get_or_create(**row)
+        loaded = {model for model, file in models}
+        if loaded & {Title, Review}:
+            rebuild_ratings()
+            # Очистка произведений каскадно удаляет и таблицу рейтингов.
+            refresh_rankings()
+        # bulk_create и COPY не отправляют сигналы моделей.
+        invalidate(*{
+            namespace for model in loaded
+            for namespace in NAMESPACES.get(model, ())
+        })
         self.stdout.write(self.style.SUCCESS('Успешно!'))
+
+    def load_sequential(self, stage, options):
+        for model, file in stage:
+            started = time.monotonic()
+            load_model(
+                model, os.path.join(options['path'], file), options,
+                progress=lambda model, total: self.report(
+                    model, total, time.monotonic() - started
+                )
+            )
+
+    def load_parallel(self, stage, options):
+        # Дочерние процессы должны открыть собственные соединения.
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=min(options['workers'], len(stage)),
+            initializer=init_worker
+        ) as executor:
+            futures = [
+                (model, executor.submit(
+                    load_model_in_worker, model._meta.label,
+                    os.path.join(options['path'], file), options
+                ))
+                for model, file in stage
+            ]
+            for model, future in futures:
+                self.report(model, *future.result())
+
+    def check_truncate(self, models):
+        """Запрещает очистку зависящих таблиц, которые не загружаются."""
+        loaded = {model for model, file in models}
+        missing = [
+            model._meta.model_name for model in get_dependents(loaded)
+            if model not in loaded
+        ]
+        if missing:
+            raise CommandError(
+                '--truncate очистит зависящие таблицы, которые не будут '
+                'загружены заново: {}. Добавьте их в --only.'.format(
+                    ', '.join(missing)
+                )
+            )
+
+    def truncate(self, models):
+        models = get_dependents(models)
+        self.stdout.write('Удаляем старые данные: {}...'.format(
+            ', '.join(model._meta.model_name for model in models)
+        ))
+        tables = [model._meta.db_table for model in reversed(models)]
+        with transaction.atomic(), connection.cursor() as cursor:
+            for sql in connection.ops.sql_flush(
+                no_style(), tables, (), allow_cascade=True
+            ):
+                cursor.execute(sql)
+
+    def report(self, model, total, elapsed):
+        self.stdout.write('{}: {} строк, {:.0f} строк/с'.format(
+            model._meta.model_name, total, total / max(elapsed, 1e-6)
+        ))
+
+    def reset_sequences(self, models):
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if not statements:
+            return
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
@@ -0,0 +1,31 @@
+from api.cache import invalidate
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from reviews.models import Title
+from reviews.ratings import rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = 'Recalculates rating, reviews count and score sum of titles'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=10000,
+            help='Количество произведений, обновляемых одним запросом'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id = Title.objects.aggregate(Max('id'))['id__max'] or 0
+        updated = 0
+        for start in range(0, last_id, batch_size):
+            with transaction.atomic():
+                updated += rebuild_ratings(Title.objects.filter(
+                    id__gt=start, id__lte=start + batch_size
+                ))
+            self.stdout.write(f'Обработано до id {start + batch_size}...')
+        invalidate('titles')
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитан рейтинг {updated} произведений.'
+        ))
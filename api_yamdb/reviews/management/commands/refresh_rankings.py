@@ -0,0 +1,41 @@
+import time
+
+from django.core.management import BaseCommand
+from reviews.rankings import refresh_rankings
+
+
+class Command(BaseCommand):
+    help = 'Recalculates top and trending rankings of titles'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Количество рейтингов, записываемых одним запросом'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Работать постоянно, пересчитывая рейтинги по расписанию'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=600,
+            help='Пауза между пересчётами в секундах'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            try:
+                created = refresh_rankings(options['batch_size'])
+            except Exception as error:
+                if not options['loop']:
+                    raise
+                # База недоступна: остаются прежние рейтинги.
+                self.stderr.write(f'Ошибка пересчёта: {error}')
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Пересчитаны рейтинги {created} произведений '
+                    f'за {time.monotonic() - started:.1f} с.'
+                ))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
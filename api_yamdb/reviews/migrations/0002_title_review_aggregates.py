@@ -0,0 +1,53 @@
+# Generated by Django 2.2.16 on 2026-10-18 17:07
+
+from django.db import migrations, models
+from django.db.models import (Count, ExpressionWrapper, IntegerField, OuterRef,
+                              Subquery, Sum)
+from django.db.models.functions import Coalesce
+
+
+def fill_review_aggregates(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    Title.objects.update(
+        reviews_count=Coalesce(Subquery(
+            reviews.annotate(value=Count('id')).values('value'),
+            output_field=IntegerField(),
+        ), 0),
+        score_sum=Coalesce(Subquery(
+            reviews.annotate(value=Sum('score')).values('value'),
+            output_field=IntegerField(),
+        ), 0),
+        rating=Subquery(
+            reviews.annotate(value=ExpressionWrapper(
+                Sum('score') / Count('id'), output_field=IntegerField()
+            )).values('value'),
+            output_field=IntegerField(),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='reviews_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(
+            fill_review_aggregates, migrations.RunPython.noop
+        ),
+    ]
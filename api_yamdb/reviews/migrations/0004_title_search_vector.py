@@ -0,0 +1,56 @@
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Название весит больше описания: совпадения в нём выше в выдаче.
+CREATE_TRIGGER = """
+CREATE FUNCTION reviews_title_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('russian', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('russian', coalesce(NEW.description, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER reviews_title_search_vector
+BEFORE INSERT OR UPDATE OF name, description, search_vector
+ON reviews_title
+FOR EACH ROW EXECUTE PROCEDURE reviews_title_search_vector();
+
+UPDATE reviews_title SET search_vector = NULL;
+
+CREATE INDEX reviews_title_search_vector_gin
+ON reviews_title USING gin (search_vector);
+"""
+
+DROP_TRIGGER = """
+DROP INDEX IF EXISTS reviews_title_search_vector_gin;
+DROP TRIGGER IF EXISTS reviews_title_search_vector ON reviews_title;
+DROP FUNCTION IF EXISTS reviews_title_search_vector();
+"""
+
+
+def create_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_TRIGGER)
+
+
+def drop_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_TRIGGER)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_title_modified'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='Поисковый вектор'),
+        ),
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
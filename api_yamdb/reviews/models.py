@@ -1,9 +1,14 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
 
 from .validators import validate_year
 
+# Конфигурация полнотекстового поиска PostgreSQL; должна совпадать
+# с конфигурацией в триггере миграции 0004_title_search_vector.
+SEARCH_CONFIG = 'russian'
+
 
 class User(AbstractUser):
     USER_ROLE = 'user'
@@ -103,8 +108,7 @@ class Title(models.Model):
     )
     genre = models.ManyToManyField(
         Genre, through='GenreTitle',
-        verbose_name='Жанр',
-        db_index=True
+        verbose_name='Жанр'
     )
     rating = models.IntegerField(
         verbose_name='Рейтинг',
@@ -112,11 +116,34 @@ class Title(models.Model):
         default=None,
         db_index=True
     )
+    reviews_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        default=0
+    )
+    score_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0
+    )
+    modified = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True,
+        db_index=True
+    )
+    # Заполняется триггером PostgreSQL из названия и описания.
+    search_vector = SearchVectorField(
+        verbose_name='Поисковый вектор',
+        null=True,
+        editable=False
+    )
 
     class Meta:
         ordering = ('name',)
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            # Сортировка списка и курсорная пагинация по (name, id).
+            models.Index(fields=['name', 'id'], name='title_name_id_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -133,9 +160,18 @@ class GenreTitle(models.Model):
         Genre, on_delete=models.SET_NULL,
         verbose_name='Жанр',
         blank=True,
-        null=True
+        null=True,
+        # Покрывается индексом ограничения unique_genre_title.
+        db_index=False
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['genre', 'title'], name='unique_genre_title'
+            )
+        ]
+
     def __str__(self):
         return self.genre.name
 
@@ -143,7 +179,9 @@ class GenreTitle(models.Model):
 class Review(models.Model):
     title = models.ForeignKey(
         Title, on_delete=models.CASCADE, related_name='reviews',
-        verbose_name='Название произведения'
+        verbose_name='Название произведения',
+        # Покрывается индексом review_title_id_idx.
+        db_index=False
     )
     text = models.TextField(max_length=500, verbose_name='Текст отзыва')
     author = models.ForeignKey(
@@ -170,15 +208,29 @@ class Review(models.Model):
                 fields=['title', 'author'], name='unique_review_author'
             )
         ]
+        indexes = [
+            # Отзывы произведения в порядке id.
+            models.Index(fields=['title', 'id'], name='review_title_id_idx'),
+            # Отзывы за последние дни для TitleRanking.velocity.
+            models.Index(fields=['pub_date'], name='review_pub_date_idx'),
+        ]
 
     def __str__(self):
         return self.text[:10]
 
+    def save(self, *args, **kwargs):
+        # Рейтинг произведения пересчитывается в post_save,
+        # поэтому отзыв и агрегаты пишутся в одной транзакции.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     review = models.ForeignKey(
         Review, on_delete=models.CASCADE, related_name='comments',
-        verbose_name='Комментарий к отзыву'
+        verbose_name='Комментарий к отзыву',
+        # Покрывается индексом comment_review_id_idx.
+        db_index=False
     )
     text = models.TextField(max_length=500, verbose_name='Текст комментария')
     author = models.ForeignKey(
@@ -193,6 +245,42 @@ class Comment(models.Model):
         ordering = ['id']
         verbose_name = 'Комментарий к отзывам'
         verbose_name_plural = 'Комментарии к отзывам'
+        indexes = [
+            # Комментарии отзыва в порядке id.
+            models.Index(
+                fields=['review', 'id'], name='comment_review_id_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text[:10]
+
+
+class TitleRanking(models.Model):
+    """Предрассчитанный рейтинг произведения для top/ и trending/.
+
+    Заполняется командой refresh_rankings; строки есть только
+    у произведений с отзывами.
+    """
+    title = models.OneToOneField(
+        Title, on_delete=models.CASCADE, primary_key=True,
+        related_name='ranking', verbose_name='Произведение'
+    )
+    score = models.FloatField(verbose_name='Взвешенная оценка')
+    velocity = models.PositiveIntegerField(
+        verbose_name='Отзывов за последние дни'
+    )
+    refreshed = models.DateTimeField(verbose_name='Дата пересчёта')
+
+    class Meta:
+        verbose_name = 'Рейтинг произведения'
+        verbose_name_plural = 'Рейтинги произведений'
+        indexes = [
+            models.Index(
+                fields=['-score', 'title'], name='ranking_score_idx'
+            ),
+            models.Index(
+                fields=['-velocity', '-score', 'title'],
+                name='ranking_velocity_idx'
+            ),
+        ]
@@ -0,0 +1,51 @@
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from .models import Review, Title, TitleRanking
+
+
+def refresh_rankings(batch_size=1000):
+    """Пересчитывает таблицу TitleRanking целиком.
+
+    Оценка — байесовское среднее: средний балл произведения,
+    дополненный RANKING_PRIOR_REVIEWS отзывами со средним баллом
+    по всему каталогу, поэтому несколько высоких оценок не выводят
+    произведение в лидеры. Скорость — число отзывов за TRENDING_DAYS.
+    Возвращает количество записанных рейтингов.
+    """
+    now = timezone.now()
+    prior = settings.RANKING_PRIOR_REVIEWS
+    totals = Title.objects.aggregate(Sum('score_sum'), Sum('reviews_count'))
+    mean = (
+        (totals['score_sum__sum'] or 0) / totals['reviews_count__sum']
+        if totals['reviews_count__sum'] else 0
+    )
+    velocity = dict(Review.objects.filter(
+        pub_date__gte=now - timedelta(days=settings.TRENDING_DAYS)
+    ).order_by().values_list('title').annotate(Count('id')))
+    titles = Title.objects.filter(reviews_count__gt=0).order_by().values_list(
+        'id', 'reviews_count', 'score_sum'
+    )
+    rankings = (
+        TitleRanking(
+            title_id=title_id,
+            score=(prior * mean + score_sum) / (prior + reviews_count),
+            velocity=velocity.get(title_id, 0),
+            refreshed=now,
+        )
+        for title_id, reviews_count, score_sum in titles.iterator()
+    )
+    with transaction.atomic():
+        TitleRanking.objects.all().delete()
+        created = 0
+        while True:
+            batch = list(islice(rankings, batch_size))
+            if not batch:
+                return created
+            TitleRanking.objects.bulk_create(batch)
+            created += len(batch)
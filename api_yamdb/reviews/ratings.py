@@ -0,0 +1,64 @@
+from django.db.models import (Case, Count, ExpressionWrapper, F, IntegerField,
+                              OuterRef, Subquery, Sum, Value, When)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Review, Title
+
+
+def apply_review_delta(title_id, score_delta, count_delta):
+    """Инкрементально обновляет агрегаты отзывов одного произведения.
+
+    Вся арифметика выполняется одним UPDATE на стороне базы данных,
+    поэтому конкурентные изменения отзывов не теряются.
+    Рейтинг, как и раньше, — целая часть среднего балла.
+    """
+    score_sum = F('score_sum') + score_delta
+    reviews_count = F('reviews_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        modified=timezone.now(),
+        score_sum=score_sum,
+        reviews_count=reviews_count,
+        rating=Case(
+            When(reviews_count__lte=-count_delta, then=Value(None)),
+            default=ExpressionWrapper(
+                score_sum / reviews_count, output_field=IntegerField()
+            ),
+            output_field=IntegerField(),
+        ),
+    )
+
+
+def rebuild_ratings(queryset=None):
+    """Пересчитывает агрегаты отзывов с нуля.
+
+    Используется для первичного заполнения и восстановления данных
+    после массовых загрузок, которые обходят сигналы моделей.
+    Возвращает количество обновлённых произведений.
+    """
+    if queryset is None:
+        queryset = Title.objects.all()
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')
+    ).order_by().values('title')
+    reviews_count = Subquery(
+        reviews.annotate(value=Count('id')).values('value'),
+        output_field=IntegerField(),
+    )
+    score_sum = Subquery(
+        reviews.annotate(value=Sum('score')).values('value'),
+        output_field=IntegerField(),
+    )
+    rating = Subquery(
+        reviews.annotate(
+            value=ExpressionWrapper(
+                Sum('score') / Count('id'), output_field=IntegerField()
+            )
+        ).values('value'),
+        output_field=IntegerField(),
+    )
+    return queryset.order_by().update(
+        reviews_count=Coalesce(reviews_count, 0),
+        score_sum=Coalesce(score_sum, 0),
+        rating=rating,
+    )
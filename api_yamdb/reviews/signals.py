@@ -0,0 +1,81 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_init,
+                                      post_save, pre_delete)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Category, Comment, Genre, GenreTitle, Review, Title
+from .ratings import apply_review_delta, rebuild_ratings
+
+
+def touch_titles(**lookup):
+    """Обновляет дату изменения произведений, попавших под фильтр."""
+    Title.objects.filter(**lookup).update(modified=timezone.now())
+
+
+@receiver(post_init, sender=Review)
+def remember_review_score(sender, instance, **kwargs):
+    """Запоминает загруженные из базы оценку и произведение отзыва."""
+    instance._initial_score = instance.__dict__.get('score')
+    instance._initial_title_id = instance.__dict__.get('title_id')
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, **kwargs):
+    if created:
+        apply_review_delta(instance.title_id, instance.score, 1)
+    elif instance._initial_score is None:
+        rebuild_ratings(Title.objects.filter(
+            pk__in={instance._initial_title_id, instance.title_id}
+        ))
+        touch_titles(pk__in={instance._initial_title_id, instance.title_id})
+    elif instance._initial_title_id != instance.title_id:
+        apply_review_delta(
+            instance._initial_title_id, -instance._initial_score, -1
+        )
+        apply_review_delta(instance.title_id, instance.score, 1)
+    else:
+        apply_review_delta(
+            instance.title_id, instance.score - instance._initial_score, 0
+        )
+    instance._initial_score = instance.score
+    instance._initial_title_id = instance.title_id
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    apply_review_delta(instance.title_id, -instance.score, -1)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def touch_comment_title(sender, instance, **kwargs):
+    touch_titles(reviews=instance.review_id)
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def touch_category_titles(sender, instance, **kwargs):
+    touch_titles(category=instance)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def touch_genre_titles(sender, instance, **kwargs):
+    touch_titles(genre=instance)
+
+
+@receiver(post_save, sender=GenreTitle)
+@receiver(post_delete, sender=GenreTitle)
+def touch_genre_title(sender, instance, **kwargs):
+    touch_titles(pk=instance.title_id)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def touch_changed_genres(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        touch_titles(pk__in=pk_set or ())
+    else:
+        touch_titles(pk=instance.pk)
@@ -0,0 +1,184 @@
+import argparse
+import os
+import sys
+import tempfile
+from os.path import abspath, dirname, join
+
+from . import report
+from .generate import generate
+from .runner import ClientTarget, HttpTarget, run
+from .scenarios import NAMES, READ_NAMES, SCENARIOS
+from .servers import compare_servers
+
+ROOT_DIR = dirname(dirname(abspath(__file__)))
+
+
+def setup_django():
+    import django
+
+    sys.path.insert(0, join(ROOT_DIR, 'api_yamdb'))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    django.setup()
+
+
+def add_generate_arguments(parser):
+    parser.add_argument('--path', default=join(
+        tempfile.gettempdir(), 'yamdb_benchmark'
+    ), help='Каталог для CSV-файлов')
+    parser.add_argument('--titles', type=int, default=1000)
+    parser.add_argument('--reviews', type=int, default=10,
+                        help='Отзывов на одно произведение')
+    parser.add_argument('--comments', type=int, default=2,
+                        help='Комментариев на один отзыв')
+    parser.add_argument('--users', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Нагрузочный бенчмарк API YaMDb'
+    )
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+    add_generate_arguments(commands.add_parser(
+        'generate', help='Сгенерировать CSV в формате load_data'
+    ))
+    add_generate_arguments(commands.add_parser(
+        'prepare', help='Сгенерировать CSV и загрузить их в базу данных'
+    ))
+    run_parser = commands.add_parser('run', help='Запустить сценарии')
+    run_parser.add_argument(
+        '--target', default='client',
+        help='client (django.test.Client) или URL сервера'
+    )
+    run_parser.add_argument('--requests', type=int, default=100)
+    run_parser.add_argument('--warmup', type=int, default=5)
+    run_parser.add_argument('--concurrency', type=int, default=1)
+    run_parser.add_argument(
+        '--scenario', nargs='+', choices=NAMES, metavar='NAME',
+        help=f'Сценарии: {", ".join(NAMES)}'
+    )
+    run_parser.add_argument(
+        '--baseline', default=report.DEFAULT_BASELINE,
+        help='JSON для сравнения (по умолчанию benchmarks/baseline.json)'
+    )
+    run_parser.add_argument(
+        '--no-baseline', dest='baseline', action='store_const', const=None,
+        help='Не сравнивать с базовой линией'
+    )
+    run_parser.add_argument('--save-baseline', help='Сохранить результат')
+    run_parser.add_argument(
+        '--tolerance', type=float, default=0.2,
+        help='Допустимый рост p95 относительно базовой линии'
+    )
+    servers_parser = commands.add_parser(
+        'compare-servers',
+        help='Сравнить gunicorn (WSGI) и uvicorn (ASGI) на подготовленной БД'
+    )
+    servers_parser.add_argument(
+        '--threads', type=int, default=4,
+        help='Потоков для Django на сервере'
+    )
+    servers_parser.add_argument(
+        '--slow-clients', type=int, default=0,
+        help='Соединений, которые не дописывают заголовки запроса'
+    )
+    servers_parser.add_argument('--requests', type=int, default=200)
+    servers_parser.add_argument('--warmup', type=int, default=5)
+    servers_parser.add_argument('--concurrency', type=int, default=20)
+    servers_parser.add_argument('--timeout', type=float, default=10)
+    servers_parser.add_argument(
+        '--scenario', nargs='+', choices=NAMES, metavar='NAME',
+        default=READ_NAMES, help=f'Сценарии: {", ".join(NAMES)}'
+    )
+    return parser
+
+
+def generate_command(options):
+    counts = generate(
+        options.path, options.titles, options.reviews, options.comments,
+        options.users, seed=options.seed
+    )
+    print(f'{options.path}: {counts}')
+
+
+def prepare_command(options):
+    generate_command(options)
+    setup_django()
+    from django.core.management import call_command
+
+    call_command('load_data', '--truncate', '--path', options.path)
+
+
+def run_command(options):
+    if options.target == 'client':
+        setup_django()
+        target = ClientTarget()
+    else:
+        target = HttpTarget(options.target)
+    scenarios = [
+        scenario for scenario in SCENARIOS
+        if not options.scenario or scenario.name in options.scenario
+    ]
+    print(report.format_table({}))
+    with target:
+        results = run(
+            target, scenarios, options.requests, options.warmup,
+            options.concurrency,
+            progress=lambda name, stats: print(report.format_row(name, stats))
+        )
+    meta = {
+        'target': target.name, 'requests': options.requests,
+        'concurrency': options.concurrency,
+    }
+    if options.save_baseline:
+        report.save_baseline(options.save_baseline, results, meta)
+    if options.baseline and options.baseline != options.save_baseline:
+        compare_baseline(options, results, meta)
+
+
+def compare_baseline(options, results, meta):
+    baseline_meta = report.load_meta(options.baseline)
+    for key in ('target', 'concurrency'):
+        if baseline_meta.get(key) != meta[key]:
+            print(
+                f'Базовая линия {options.baseline} снята с {key}='
+                f'{baseline_meta.get(key)}, сравнение пропущено'
+            )
+            return
+    regressions = report.compare(
+        results, report.load_baseline(options.baseline), options.tolerance
+    )
+    for regression in regressions:
+        print(f'Регрессия: {regression}')
+    if regressions:
+        sys.exit(1)
+
+
+def compare_servers_command(options):
+    scenarios = [
+        scenario for scenario in SCENARIOS if scenario.name in options.scenario
+    ]
+    print(report.format_table({}))
+    compare_servers(
+        scenarios, options.threads, options.slow_clients, options.requests,
+        options.warmup, options.concurrency, options.timeout,
+        progress=lambda kind, name, stats: print(
+            report.format_row(f'{kind} {name}', stats)
+        )
+    )
+
+
+def main():
+    options = get_parser().parse_args()
+    {
+        'generate': generate_command,
+        'prepare': prepare_command,
+        'run': run_command,
+        'compare-servers': compare_servers_command,
+    }[options.command](options)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+import csv
+import os
+import random
+
+BENCH_USER = 'bench'
+BENCH_ADMIN = 'bench_admin'
+# Код подтверждения пользователей бенчмарка: по нему выдаётся JWT.
+BENCH_CODE = 'bench'
+
+WORDS = (
+    'война', 'мир', 'любовь', 'море', 'город', 'ночь', 'звезда', 'дорога',
+    'время', 'тайна', 'остров', 'песня', 'зима', 'солнце', 'память', 'дом',
+)
+PUB_DATE = '2020-01-01T00:00:00Z'
+
+
+def write_csv(path, name, header, rows):
+    with open(os.path.join(path, name), 'w', encoding='utf-8',
+              newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def phrase(rng, length):
+    return ' '.join(rng.choice(WORDS) for _ in range(length))
+
+
+def generate(path, titles=1000, reviews=10, comments=2, users=None,
+             categories=10, genres=20, seed=0):
+    """Пишет users, category, genre, titles, genre_title, review и comments.
+
+    На каждое произведение приходится `reviews` отзывов разных авторов,
+    на каждый отзыв — `comments` комментариев. Пользователей должно быть
+    не меньше, чем отзывов на одно произведение.
+    Возвращает количество строк в каждом файле.
+    """
+    rng = random.Random(seed)
+    users = max(users or reviews * 2, reviews)
+    os.makedirs(path, exist_ok=True)
+
+    header = (
+        'id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name',
+        'confirmation_code'
+    )
+    rows = [
+        (1, BENCH_USER, 'bench@yamdb.fake', 'user', '', '', '', BENCH_CODE),
+        (2, BENCH_ADMIN, 'bench_admin@yamdb.fake', 'admin', '', '', '',
+         BENCH_CODE),
+    ]
+    rows.extend(
+        (3 + index, f'user{index}', f'user{index}@yamdb.fake', 'user',
+         '', '', '', '')
+        for index in range(users)
+    )
+    write_csv(path, 'users.csv', header, rows)
+    author_ids = range(3, 3 + users)
+
+    write_csv(path, 'category.csv', ('id', 'name', 'slug'), (
+        (index, f'Категория {index}', f'category-{index}')
+        for index in range(1, categories + 1)
+    ))
+    write_csv(path, 'genre.csv', ('id', 'name', 'slug'), (
+        (index, f'Жанр {index}', f'genre-{index}')
+        for index in range(1, genres + 1)
+    ))
+    write_csv(
+        path, 'titles.csv',
+        ('id', 'name', 'year', 'category_id', 'description'),
+        (
+            (index, f'{phrase(rng, 2).capitalize()} {index}',
+             rng.randint(1950, 2020), rng.randint(1, categories),
+             phrase(rng, 12))
+            for index in range(1, titles + 1)
+        )
+    )
+
+    links = []
+    for title_id in range(1, titles + 1):
+        for genre_id in rng.sample(range(1, genres + 1), rng.randint(1, 3)):
+            links.append((len(links) + 1, title_id, genre_id))
+    write_csv(path, 'genre_title.csv', ('id', 'title_id', 'genre_id'), links)
+
+    review_id = comment_id = 0
+    review_file = open(
+        os.path.join(path, 'review.csv'), 'w', encoding='utf-8', newline=''
+    )
+    comment_file = open(
+        os.path.join(path, 'comments.csv'), 'w', encoding='utf-8', newline=''
+    )
+    with review_file, comment_file:
+        review_writer = csv.writer(review_file)
+        review_writer.writerow(
+            ('id', 'title_id', 'text', 'author_id', 'score', 'pub_date')
+        )
+        comment_writer = csv.writer(comment_file)
+        comment_writer.writerow(
+            ('id', 'review_id', 'text', 'author_id', 'pub_date')
+        )
+        for title_id in range(1, titles + 1):
+            for author_id in rng.sample(author_ids, reviews):
+                review_id += 1
+                review_writer.writerow((
+                    review_id, title_id, phrase(rng, 20), author_id,
+                    rng.randint(1, 10), PUB_DATE
+                ))
+                for _ in range(comments):
+                    comment_id += 1
+                    comment_writer.writerow((
+                        comment_id, review_id, phrase(rng, 8),
+                        rng.choice(author_ids), PUB_DATE
+                    ))
+    return {
+        'users': len(rows), 'categories': categories, 'genres': genres,
+        'titles': titles, 'genre_titles': len(links),
+        'reviews': review_id, 'comments': comment_id,
+    }
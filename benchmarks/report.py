@@ -0,0 +1,70 @@
+import json
+from os.path import abspath, dirname, join
+
+COLUMNS = ('p50', 'p95', 'p99', 'rps', 'queries', 'errors')
+
+# Базовая линия в репозитории: `run` сравнивает с ней по умолчанию.
+DEFAULT_BASELINE = join(dirname(abspath(__file__)), 'baseline.json')
+
+
+def format_row(name, stats):
+    values = [
+        '-' if stats[column] is None else str(stats[column])
+        for column in COLUMNS
+    ]
+    return f'{name:<24}' + ''.join(f'{value:>10}' for value in values)
+
+
+def format_table(results):
+    lines = [
+        f'{"scenario":<24}' + ''.join(f'{column:>10}' for column in COLUMNS),
+    ]
+    lines.extend(format_row(name, stats) for name, stats in results.items())
+    return '\n'.join(lines)
+
+
+def save_baseline(path, results, meta=None):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(
+            {'meta': meta or {}, 'scenarios': results}, file,
+            ensure_ascii=False, indent=2, sort_keys=True
+        )
+
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)['scenarios']
+
+
+def load_meta(path):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)['meta']
+
+
+def compare(results, baseline, tolerance=0.2):
+    """Возвращает описания регрессий относительно базовой линии.
+
+    Регрессия — рост p95 больше чем на `tolerance`, любой рост числа
+    запросов к БД или появление ошибок.
+    """
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if stats['p95'] > base['p95'] * (1 + tolerance):
+            regressions.append(
+                f'{name}: p95 {base["p95"]} -> {stats["p95"]} мс'
+            )
+        if None not in (stats['queries'], base['queries']) and (
+            stats['queries'] > base['queries']
+        ):
+            regressions.append(
+                f'{name}: запросов к БД {base["queries"]} -> '
+                f'{stats["queries"]}'
+            )
+        if stats['errors'] > base['errors']:
+            regressions.append(
+                f'{name}: ошибок {base["errors"]} -> {stats["errors"]}'
+            )
+    return regressions
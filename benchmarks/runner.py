@@ -0,0 +1,263 @@
+import json
+import logging
+import math
+import re
+import threading
+import urllib.error
+import urllib.request
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from .generate import BENCH_ADMIN, BENCH_CODE, BENCH_USER
+
+Result = namedtuple('Result', 'status body queries')
+
+QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+def parse_queries(server_timing):
+    """Количество запросов к БД из заголовка Server-Timing."""
+    match = QUERIES.search(server_timing or '')
+    return int(match.group(1)) if match else None
+
+
+def to_json(body):
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+class ClientTarget:
+    """Запросы через django.test.Client к настроенной базе данных.
+
+    Server-Timing включается на время работы, чтобы считать
+    запросы к БД так же, как на живом сервере, а JSON-лог запросов
+    и ограничение частоты запросов отключаются, чтобы не искажать замеры.
+    """
+    name = 'client'
+
+    def __enter__(self):
+        from django.conf import settings
+        from django.test.utils import override_settings
+
+        self.settings = override_settings(
+            SERVER_TIMING=True, REST_FRAMEWORK=dict(
+                settings.REST_FRAMEWORK, DEFAULT_THROTTLE_RATES={}
+            )
+        )
+        self.settings.enable()
+        self.logger = logging.getLogger('api.performance')
+        self.logger.disabled = True
+        self.local = threading.local()
+        return self
+
+    def __exit__(self, *args):
+        self.logger.disabled = False
+        self.settings.disable()
+
+    def request(self, method, path, data=None, token=None):
+        from django.test import Client
+
+        if not hasattr(self.local, 'client'):
+            self.local.client = Client()
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        response = self.local.client.generic(
+            method, path, json.dumps(data) if data is not None else '',
+            content_type='application/json', **headers
+        )
+        return Result(
+            response.status_code, to_json(response.content),
+            parse_queries(response.get('Server-Timing'))
+        )
+
+    def ensure_users(self):
+        """Создаёт пользователей бенчмарка, если данные не из генератора."""
+        from django.contrib.auth import get_user_model
+
+        for username, role in ((BENCH_USER, 'user'), (BENCH_ADMIN, 'admin')):
+            get_user_model().objects.update_or_create(
+                username=username, defaults={
+                    'email': f'{username}@yamdb.fake', 'role': role,
+                    'confirmation_code': BENCH_CODE,
+                }
+            )
+
+
+class HttpTarget:
+    """Запросы к запущенному серверу, например http://localhost:8000.
+
+    Количество запросов к БД доступно, если на сервере SERVER_TIMING=True.
+    Запрос, не получивший ответа за timeout секунд, возвращает статус 0.
+    """
+
+    def __init__(self, base_url, timeout=30):
+        self.name = base_url
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def request(self, method, path, data=None, token=None):
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        request = urllib.request.Request(
+            self.base_url + path, method=method, headers=headers,
+            data=json.dumps(data).encode() if data is not None else None
+        )
+        try:
+            with urllib.request.urlopen(
+                request, timeout=self.timeout
+            ) as response:
+                return Result(
+                    response.status, to_json(response.read()),
+                    parse_queries(response.headers.get('Server-Timing'))
+                )
+        except urllib.error.HTTPError as error:
+            return Result(
+                error.code, to_json(error.read()),
+                parse_queries(error.headers.get('Server-Timing'))
+            )
+        except OSError:
+            return Result(0, None, None)
+
+    def ensure_users(self):
+        pass
+
+
+def get_tokens(target):
+    tokens = {}
+    for role, username in (('user', BENCH_USER), ('admin', BENCH_ADMIN)):
+        result = target.request('POST', '/api/v1/auth/token/', {
+            'username': username, 'confirmation_code': BENCH_CODE,
+        })
+        if result.status != 200:
+            raise RuntimeError(
+                f'Не удалось получить токен {username}: {result.status}. '
+                'Подготовьте данные командой `python -m benchmarks prepare`.'
+            )
+        tokens[role] = result.body['access']
+    return tokens
+
+
+def find_commented_review(target):
+    """Первое произведение с отзывом, у которого есть комментарии."""
+    titles = target.request('GET', '/api/v1/titles/?page_size=20').body
+    for title in titles['results']:
+        reviews = target.request(
+            'GET', f'/api/v1/titles/{title["id"]}/reviews/'
+        ).body
+        for review in reviews['results']:
+            comments = target.request(
+                'GET',
+                f'/api/v1/titles/{title["id"]}/reviews/{review["id"]}'
+                '/comments/'
+            ).body
+            if comments['results']:
+                return title, review, comments['results'][0]
+    raise RuntimeError('В базе нет отзывов с комментариями.')
+
+
+def find_own_review(target, title_id, token):
+    """Отзыв пользователя бенчмарка на произведение, при необходимости новый.
+    """
+    path = f'/api/v1/titles/{title_id}/reviews/'
+    result = target.request(
+        'POST', path, {'text': 'Отзыв бенчмарка', 'score': 5}, token
+    )
+    if result.status == 201:
+        return result.body['id']
+    while path:
+        page = target.request('GET', path).body
+        for review in page['results']:
+            if review['author'] == BENCH_USER:
+                return review['id']
+        path = page['next'] and page['next'][page['next'].index('/api/'):]
+    raise RuntimeError('Не удалось создать отзыв пользователя бенчмарка.')
+
+
+def discover(target, tokens):
+    """Подставляемые в сценарии идентификаторы из данных API."""
+    title, review, comment = find_commented_review(target)
+    category = target.request('GET', '/api/v1/categories/').body
+    genre = target.request('GET', '/api/v1/genres/').body
+    return {
+        'title': title['id'],
+        'year': title['year'],
+        'word': title['name'].split()[0],
+        'review': review['id'],
+        'comment': comment['id'],
+        'category': category['results'][0]['slug'],
+        'genre': genre['results'][0]['slug'],
+        'own_review': find_own_review(target, title['id'], tokens['user']),
+    }
+
+
+def percentile(values, fraction):
+    """Перцентиль по методу ближайшего ранга; values отсортированы."""
+    index = max(0, min(len(values) - 1, math.ceil(fraction * len(values)) - 1))
+    return values[index]
+
+
+def summarize(samples, elapsed):
+    latencies = sorted(latency * 1000 for latency, result in samples)
+    queries = [
+        result.queries for latency, result in samples
+        if result.queries is not None
+    ]
+    return {
+        'requests': len(samples),
+        'errors': sum(
+            not 0 < result.status < 400 for latency, result in samples
+        ),
+        'p50': round(percentile(latencies, 0.50), 3),
+        'p95': round(percentile(latencies, 0.95), 3),
+        'p99': round(percentile(latencies, 0.99), 3),
+        'rps': round(len(samples) / elapsed, 1),
+        'queries': (
+            round(sum(queries) / len(queries), 2) if queries else None
+        ),
+    }
+
+
+def run_scenario(target, scenario, context, tokens, requests=100, warmup=5,
+                 concurrency=1):
+    path = scenario.path.format(**context)
+    token = tokens.get(scenario.user)
+
+    def call(number):
+        started = perf_counter()
+        result = target.request(scenario.method, path, scenario.data, token)
+        return perf_counter() - started, result
+
+    for number in range(warmup):
+        call(number)
+    started = perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(executor.map(call, range(requests)))
+    else:
+        samples = [call(number) for number in range(requests)]
+    return summarize(samples, perf_counter() - started)
+
+
+def run(target, scenarios, requests=100, warmup=5, concurrency=1,
+        progress=None):
+    """Прогоняет сценарии и возвращает {имя: статистика}."""
+    target.ensure_users()
+    tokens = get_tokens(target)
+    context = discover(target, tokens)
+    results = {}
+    for scenario in scenarios:
+        results[scenario.name] = run_scenario(
+            target, scenario, context, tokens, requests, warmup, concurrency
+        )
+        if progress:
+            progress(scenario.name, results[scenario.name])
+    return results
@@ -0,0 +1,45 @@
+from collections import namedtuple
+
+# user: None — анонимный запрос, 'user' или 'admin' — с JWT.
+Scenario = namedtuple('Scenario', 'name method path user data')
+
+TITLES = '/api/v1/titles/'
+TITLE = TITLES + '{title}/'
+REVIEWS = TITLE + 'reviews/'
+COMMENTS = REVIEWS + '{review}/comments/'
+
+SCENARIOS = [
+    Scenario('categories-list', 'GET', '/api/v1/categories/', None, None),
+    Scenario('genres-list', 'GET', '/api/v1/genres/', None, None),
+    Scenario('titles-list', 'GET', TITLES, None, None),
+    Scenario('titles-cursor', 'GET', TITLES + '?pagination=cursor',
+             None, None),
+    Scenario('titles-filter', 'GET',
+             TITLES + '?genre={genre}&category={category}', None, None),
+    Scenario('titles-year', 'GET', TITLES + '?year={year}', None, None),
+    Scenario('titles-search', 'GET', TITLES + '?search={word}', None, None),
+    Scenario('titles-top', 'GET', TITLES + 'top/', None, None),
+    Scenario('titles-trending', 'GET',
+             TITLES + 'trending/?category={category}', None, None),
+    Scenario('titles-facets', 'GET', TITLES + 'facets/?genre={genre}',
+             None, None),
+    Scenario('titles-detail', 'GET', TITLE, None, None),
+    Scenario('reviews-list', 'GET', REVIEWS, None, None),
+    Scenario('reviews-detail', 'GET', REVIEWS + '{review}/', None, None),
+    Scenario('comments-list', 'GET', COMMENTS, None, None),
+    Scenario('comments-detail', 'GET', COMMENTS + '{comment}/', None, None),
+    Scenario('users-me', 'GET', '/api/v1/users/me/', 'user', None),
+    Scenario('users-list', 'GET', '/api/v1/users/', 'admin', None),
+    Scenario('reviews-update', 'PATCH', REVIEWS + '{own_review}/', 'user',
+             {'text': 'Обновлённый отзыв'}),
+    Scenario('comments-create', 'POST', COMMENTS, 'user',
+             {'text': 'Комментарий бенчмарка'}),
+]
+
+NAMES = [scenario.name for scenario in SCENARIOS]
+
+# Анонимные запросы на чтение каталога — основная нагрузка.
+READ_NAMES = [
+    scenario.name for scenario in SCENARIOS
+    if scenario.method == 'GET' and scenario.user is None
+]
@@ -0,0 +1,104 @@
+import os
+import socket
+import subprocess
+from contextlib import ExitStack, contextmanager
+from os.path import abspath, dirname, join
+from time import monotonic, sleep
+
+from .runner import HttpTarget, discover, get_tokens, run_scenario
+
+PROJECT_DIR = join(dirname(dirname(abspath(__file__))), 'api_yamdb')
+
+# Оба сервера получают одинаковое число потоков для Django:
+# gthread-воркер gunicorn и пул ASGI-приложения под uvicorn.
+SERVERS = {
+    'wsgi': [
+        'api_yamdb.wsgi:application', '--worker-class', 'gthread',
+        '--threads', '{threads}',
+    ],
+    'asgi': [
+        'api_yamdb.asgi:application', '--worker-class',
+        'uvicorn.workers.UvicornH11Worker',
+    ],
+}
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, process, timeout=30):
+    deadline = monotonic() + timeout
+    while monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('Сервер завершился при запуске.')
+        try:
+            socket.create_connection(('127.0.0.1', port), 1).close()
+            return
+        except OSError:
+            sleep(0.1)
+    raise RuntimeError(f'Сервер не открыл порт {port} за {timeout} с.')
+
+
+@contextmanager
+def serve(kind, threads, workers=1):
+    """Запускает gunicorn с WSGI или ASGI-воркерами и отдаёт его URL."""
+    port = get_free_port()
+    command = [
+        'gunicorn', '--bind', f'127.0.0.1:{port}',
+        '--workers', str(workers), '--log-level', 'warning',
+    ] + [argument.format(threads=threads) for argument in SERVERS[kind]]
+    environ = dict(
+        os.environ, ASGI_WORKER_THREADS=str(threads), SERVER_TIMING='True',
+        PERFORMANCE_LOG_LEVEL='WARNING', THROTTLE_AUTH_RATE='',
+        THROTTLE_ANON_READ_RATE='', THROTTLE_USER_WRITE_RATE=''
+    )
+    process = subprocess.Popen(command, cwd=PROJECT_DIR, env=environ)
+    try:
+        wait_for_port(port, process)
+        yield f'http://127.0.0.1:{port}'
+    finally:
+        process.terminate()
+        process.wait(10)
+
+
+def open_slow_clients(stack, url, count):
+    """Соединения, которые отправили часть заголовков и замолчали.
+
+    Так ведут себя клиенты на медленных сетях: синхронный сервер
+    держит на каждом из них поток.
+    """
+    host, port = url.rsplit('/', 1)[-1].split(':')
+    for number in range(count):
+        sock = stack.enter_context(
+            socket.create_connection((host, int(port)))
+        )
+        sock.sendall(b'GET /api/v1/titles/ HTTP/1.1\r\nHost: slow\r\n')
+
+
+def compare_servers(scenarios, threads=4, slow_clients=0, requests=100,
+                    warmup=5, concurrency=10, timeout=10, progress=None):
+    """Прогоняет сценарии на WSGI и ASGI-сервере: {сервер: результаты}.
+
+    Медленные клиенты подключаются после получения токенов, поэтому
+    их влияние видно в статистике сценариев, а не в подготовке.
+    """
+    results = {}
+    for kind in SERVERS:
+        results[kind] = {}
+        with serve(kind, threads) as url, ExitStack() as stack:
+            target = HttpTarget(url, timeout)
+            tokens = get_tokens(target)
+            context = discover(target, tokens)
+            open_slow_clients(stack, url, slow_clients)
+            for scenario in scenarios:
+                stats = run_scenario(
+                    target, scenario, context, tokens, requests, warmup,
+                    concurrency
+                )
+                results[kind][scenario.name] = stats
+                if progress:
+                    progress(kind, scenario.name, stats)
+    return results
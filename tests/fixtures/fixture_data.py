@@ -0,0 +1,44 @@
+import pytest
+
+
+@pytest.fixture
+def category():
+    from reviews.models import Category
+
+    return Category.objects.create(name='Фильм', slug='movie')
+
+
+@pytest.fixture
+def genres():
+    from reviews.models import Genre
+
+    return [
+        Genre.objects.create(name='Драма', slug='drama'),
+        Genre.objects.create(name='Комедия', slug='comedy'),
+    ]
+
+
+@pytest.fixture
+def title(category, genres):
+    from reviews.models import Title
+
+    title = Title.objects.create(
+        name='Побег из Шоушенка', year=1994, category=category
+    )
+    title.genre.set(genres)
+    return title
+
+
+@pytest.fixture
+def titles(category, genres):
+    from reviews.models import Title
+
+    result = []
+    for index in range(6):
+        title = Title.objects.create(
+            name=f'Произведение {index}', year=2000 + index,
+            category=category, description=f'Описание {index}'
+        )
+        title.genre.set(genres[:index % 2 + 1])
+        result.append(title)
+    return result
@@ -0,0 +1,50 @@
+import pytest
+
+
+@pytest.fixture
+def admin(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestAdmin', email='testadmin@yamdb.fake',
+        password='1234567', role='admin', bio='admin bio'
+    )
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestUser', email='testuser@yamdb.fake',
+        password='1234567', role='user', bio='user bio'
+    )
+
+
+@pytest.fixture
+def another_user(django_user_model):
+    return django_user_model.objects.create_user(
+        username='TestUserAnother', email='testuseranother@yamdb.fake',
+        password='1234567', role='user', bio='another bio'
+    )
+
+
+def get_client(user):
+    from api.serializers import MyTokenObtainPairSerializer
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    refresh = MyTokenObtainPairSerializer.get_token(user)
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+    return client
+
+
+@pytest.fixture
+def admin_client(admin):
+    return get_client(admin)
+
+
+@pytest.fixture
+def user_client(user):
+    return get_client(user)
+
+
+@pytest.fixture
+def another_user_client(another_user):
+    return get_client(another_user)
@@ -0,0 +1,73 @@
+import asyncio
+import json
+
+import pytest
+
+
+def call_asgi(application, method, path, chunks=(b'',), headers=()):
+    """Выполняет запрос к ASGI-приложению и возвращает статус и тело."""
+    scope = {
+        'type': 'http', 'http_version': '1.1', 'method': method,
+        'path': path, 'query_string': b'', 'root_path': '',
+        'headers': [(b'host', b'testserver')] + list(headers),
+        'server': ('testserver', 80), 'client': ('127.0.0.1', 12345),
+    }
+    messages = [
+        {'type': 'http.request', 'body': chunk, 'more_body': True}
+        for chunk in chunks[:-1]
+    ] + [{'type': 'http.request', 'body': chunks[-1]}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(application(scope, receive, send))
+    assert sent[0]['type'] == 'http.response.start'
+    return sent[0]['status'], b''.join(
+        message.get('body', b'') for message in sent[1:]
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsgiApplication:
+
+    @pytest.fixture
+    def application(self):
+        from api.asgi import ThreadPoolWsgiToAsgi
+        from django.core.wsgi import get_wsgi_application
+
+        application = ThreadPoolWsgiToAsgi(get_wsgi_application(), 2)
+        yield application
+        application.executor.shutdown()
+
+    def test_get(self, application, client, titles):
+        status, body = call_asgi(
+            application, 'GET', f'/api/v1/titles/{titles[0].id}/'
+        )
+        assert status == 200
+        assert json.loads(body) == client.get(
+            f'/api/v1/titles/{titles[0].id}/'
+        ).json(), 'Проверьте, что ASGI-приложение отвечает как WSGI'
+
+    def test_chunked_body(self, application, user):
+        user.confirmation_code = 'code'
+        user.save()
+        data = json.dumps({
+            'username': user.username, 'confirmation_code': 'code'
+        }).encode()
+        status, body = call_asgi(
+            application, 'POST', '/api/v1/auth/token/',
+            chunks=(data[:10], data[10:]),
+            headers=[
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(data)).encode()),
+            ]
+        )
+        assert status == 200, (
+            'Проверьте, что тело запроса из нескольких сообщений '
+            'читается целиком'
+        )
+        assert 'access' in json.loads(body)
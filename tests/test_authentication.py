@@ -0,0 +1,86 @@
+import pytest
+
+
+def user_queries(context):
+    """Запросы пользователя по id — их выполняет аутентификация."""
+    return [
+        query['sql'] for query in context.captured_queries
+        if 'WHERE "reviews_user"."id" =' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestStatelessAuthentication:
+
+    def test_token_claims(self, client, user):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        user.confirmation_code = 'code'
+        user.save()
+        response = client.post('/api/v1/auth/token/', data={
+            'username': user.username, 'confirmation_code': 'code'
+        })
+        token = AccessToken(response.json()['access'])
+        assert token['role'] == 'user'
+        assert token['is_superuser'] is False
+        assert token['username'] == user.username
+
+    def test_no_user_query_per_request(self, admin_client):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as context:
+            assert admin_client.get('/api/v1/users/').status_code == 200
+        assert len(user_queries(context)) == 1, (
+            'Проверьте, что состояние пользователя читается один раз'
+        )
+        with CaptureQueriesContext(connection) as context:
+            assert admin_client.get('/api/v1/users/').status_code == 200
+        assert user_queries(context) == [], (
+            'Проверьте, что пользователь из токена не загружается из БД '
+            'на каждый запрос'
+        )
+
+    def test_role_change_revokes_token(self, admin, admin_client):
+        assert admin_client.get('/api/v1/users/').status_code == 200
+        admin.role = 'user'
+        admin.save()
+        response = admin_client.get('/api/v1/users/')
+        assert response.status_code == 401, (
+            'Проверьте, что токен, выданный до смены роли, отклоняется'
+        )
+        assert response.json()['code'] == 'token_revoked'
+
+    def test_inactive_user(self, user, user_client):
+        user.is_active = False
+        user.save()
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == 401, (
+            'Проверьте, что токен отключённого пользователя отклоняется'
+        )
+
+    def test_token_without_claims(self, django_user_model, title):
+        from reviews.models import Review
+        from rest_framework.test import APIClient
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        moderator = django_user_model.objects.create_user(
+            username='moderator', email='moderator@yamdb.fake',
+            role='moderator'
+        )
+        author = django_user_model.objects.create_user(
+            username='author', email='author@yamdb.fake'
+        )
+        review = Review.objects.create(
+            title=title, author=author, text='Отзыв', score=5
+        )
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Bearer {}'.format(
+            RefreshToken.for_user(moderator).access_token
+        ))
+        response = client.delete(
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/'
+        )
+        assert response.status_code == 204, (
+            'Проверьте, что токены без claims роли получают её из БД'
+        )
@@ -0,0 +1,59 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBenchmarks:
+
+    def test_generate_and_run(self, tmp_path):
+        from benchmarks.generate import generate
+        from benchmarks.runner import ClientTarget, run
+        from benchmarks.scenarios import SCENARIOS
+        from reviews.models import Comment, Review, Title
+
+        counts = generate(str(tmp_path), titles=5, reviews=3, comments=2)
+        assert counts['reviews'] == 15 and counts['comments'] == 30
+        call_command('load_data', '--truncate', '--path', str(tmp_path))
+        assert Title.objects.count() == 5
+        assert Review.objects.count() == 15
+        assert Comment.objects.count() == 30
+
+        with ClientTarget() as target:
+            results = run(target, SCENARIOS, requests=2, warmup=0)
+        assert set(results) == {scenario.name for scenario in SCENARIOS}
+        for name, stats in results.items():
+            assert stats['errors'] == 0, (
+                f'Проверьте, что сценарий {name} выполняется без ошибок'
+            )
+            assert stats['queries'] is not None
+            assert stats['p50'] <= stats['p95'] <= stats['p99']
+
+    def test_compare(self):
+        from benchmarks.report import compare
+
+        base = {'p95': 10.0, 'queries': 3.0, 'errors': 0}
+        assert compare({'titles-list': dict(base, p95=11.0)}, {
+            'titles-list': base
+        }) == []
+        regressions = compare({'titles-list': dict(
+            base, p95=13.0, queries=4.0
+        )}, {'titles-list': base})
+        assert len(regressions) == 2, (
+            'Проверьте, что рост p95 и числа запросов считается регрессией'
+        )
+
+    def test_default_baseline(self):
+        from benchmarks.__main__ import get_parser
+        from benchmarks.report import (
+            DEFAULT_BASELINE, load_baseline, load_meta
+        )
+
+        options = get_parser().parse_args(['run'])
+        assert options.baseline == DEFAULT_BASELINE, (
+            'Проверьте, что `run` по умолчанию сравнивает с '
+            'benchmarks/baseline.json'
+        )
+        assert load_meta(DEFAULT_BASELINE)['target'] == 'client'
+        assert 'titles-list' in load_baseline(DEFAULT_BASELINE)
+        options = get_parser().parse_args(['run', '--no-baseline'])
+        assert options.baseline is None
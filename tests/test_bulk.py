@@ -0,0 +1,130 @@
+import json
+
+import pytest
+
+
+def post(client, path, data):
+    return client.post(
+        f'/api/v1/{path}/bulk/', data=json.dumps(data),
+        content_type='application/json'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestBulk:
+
+    def test_permissions(self, client, user_client):
+        for path in ('categories', 'genres', 'titles', 'titles/genres'):
+            assert post(client, path, []).status_code == 401, (
+                f'Проверьте, что {path}/bulk/ недоступен анонимным '
+                'пользователям'
+            )
+            assert post(user_client, path, []).status_code == 403
+
+    def test_categories(self, admin_client, category):
+        from reviews.models import Category
+
+        response = post(admin_client, 'categories', [
+            {'name': 'Книга', 'slug': 'book'},
+            {'name': 'Фильм', 'slug': 'movie'},
+            {'name': 'Музыка', 'slug': 'music'},
+            {'name': 'Ещё музыка', 'slug': 'music'},
+            {'name': 'Без slug'},
+        ])
+        assert response.status_code == 207, (
+            'Проверьте, что при частичном успехе возвращается 207'
+        )
+        results = response.json()
+        assert [result['status'] for result in results] == [
+            201, 400, 201, 400, 400
+        ]
+        assert results[0]['data'] == {'name': 'Книга', 'slug': 'book'}
+        assert set(results[1]['errors']) == {'slug'}
+        assert set(results[3]['errors']) == {'slug'}
+        assert set(Category.objects.values_list('slug', flat=True)) == {
+            'book', 'movie', 'music'
+        }
+
+    def test_reserved_slug(self, admin_client):
+        for path in ('categories', 'genres'):
+            response = admin_client.post(
+                f'/api/v1/{path}/', data={'name': 'Пакет', 'slug': 'bulk'}
+            )
+            assert response.status_code == 400, (
+                f'Проверьте, что slug "bulk" в {path}/ запрещён: '
+                'адрес объекта совпал бы с bulk/'
+            )
+            results = post(admin_client, path, [
+                {'name': 'Пакет', 'slug': 'bulk'}
+            ]).json()
+            assert set(results[0]['errors']) == {'slug'}
+
+    def test_titles(self, admin_client, client, category, genres):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        assert client.get('/api/v1/titles/').json()['count'] == 0
+        items = [
+            {
+                'name': f'Произведение {index}', 'year': 2000 + index,
+                'genre': ['drama', 'comedy'][:index % 2 + 1],
+                'category': 'movie',
+            }
+            for index in range(20)
+        ]
+        items.append({'name': 'Ошибка', 'year': 2000, 'genre': ['horror'],
+                      'category': 'movie'})
+        items.append({'name': 'Ошибка', 'year': 2000, 'genre': [],
+                      'category': 'book'})
+        with CaptureQueriesContext(connection) as context:
+            response = post(admin_client, 'titles', items)
+        assert response.status_code == 207
+        results = response.json()
+        assert set(results[-2]['errors']) == {'genre'}
+        assert set(results[-1]['errors']) == {'category'}
+        if connection.features.can_return_ids_from_bulk_insert:
+            assert len(context) < 20, (
+                'Проверьте, что произведения создаются пакетно'
+            )
+        listed = client.get('/api/v1/titles/?page_size=100').json()
+        assert listed['count'] == 20, (
+            'Проверьте, что пакетное создание сбрасывает кэш списка'
+        )
+        by_id = {item['id']: item for item in listed['results']}
+        assert [by_id[result['data']['id']] for result in results[:20]] == [
+            result['data'] for result in results[:20]
+        ], 'Проверьте, что ответ совпадает с элементами списка произведений'
+
+    def test_genre_links(self, admin_client, client, titles, genres):
+        title = titles[0]
+        before = client.get(f'/api/v1/titles/{title.id}/')
+        response = post(admin_client, 'titles/genres', [
+            {'title': title.id, 'genre': 'comedy'},
+            {'title': title.id, 'genre': 'drama'},
+            {'title': title.id, 'genre': 'horror'},
+            {'title': 0, 'genre': 'drama'},
+        ])
+        assert response.status_code == 207
+        assert [result['status'] for result in response.json()] == [
+            201, 400, 400, 400
+        ]
+        response = client.get(
+            f'/api/v1/titles/{title.id}/', HTTP_IF_NONE_MATCH=before['ETag']
+        )
+        assert response.status_code == 200, (
+            'Проверьте, что добавление жанров меняет версию произведения'
+        )
+        assert [genre['slug'] for genre in response.json()['genre']] == [
+            'comedy', 'drama'
+        ]
+
+    def test_limits(self, admin_client, settings):
+        settings.BULK_MAX_ITEMS = 2
+        for data in ([], {'name': 'Книга', 'slug': 'book'}, [{}] * 3):
+            assert post(admin_client, 'categories', data).status_code == 400
+        response = post(admin_client, 'categories', [{}, {}])
+        assert response.status_code == 400
+        assert len(response.json()) == 2, (
+            'Проверьте, что без корректных элементов возвращаются '
+            'ошибки каждого элемента'
+        )
@@ -0,0 +1,49 @@
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class TestResponseCache:
+
+    def test_list_is_cached(self, client, titles, django_assert_num_queries):
+        response = client.get('/api/v1/titles/?year=2001&page=1')
+        assert response['X-Cache'] == 'MISS'
+        # ETag строится по поколению кэша, без запросов к базе.
+        with django_assert_num_queries(0):
+            cached = client.get('/api/v1/titles/?page=1&year=2001')
+        assert cached['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный запрос списка отдаётся из кэша '
+            'независимо от порядка параметров'
+        )
+        assert cached.json() == response.json()
+
+    @pytest.mark.parametrize('url', [
+        '/api/v1/titles/', '/api/v1/genres/', '/api/v1/categories/'
+    ])
+    def test_invalidation(self, client, titles, url):
+        from reviews.models import Category, Genre
+
+        client.get(url)
+        assert client.get(url)['X-Cache'] == 'HIT'
+        Genre.objects.create(name='Ужасы', slug='horror')
+        Category.objects.create(name='Книга', slug='book')
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS', (
+            f'Проверьте, что кэш `{url}` сбрасывается при изменении данных'
+        )
+
+    def test_review_invalidates_titles(self, client, title, user_client):
+        client.get('/api/v1/titles/')
+        user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'Отзыв', 'score': 6}
+        )
+        response = client.get('/api/v1/titles/')
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['results'][0]['rating'] == 6
+
+    def test_stats(self, client, admin_client, user_client, titles):
+        client.get('/api/v1/genres/')
+        client.get('/api/v1/genres/')
+        assert user_client.get('/api/v1/stats/cache/').status_code == 403
+        response = admin_client.get('/api/v1/stats/cache/')
+        assert response.json() == {'hits': 1, 'misses': 1}
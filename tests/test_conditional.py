@@ -0,0 +1,78 @@
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConditionalGet:
+
+    def assert_not_modified(self, client, url, **headers):
+        response = client.get(url, **headers)
+        assert response.status_code == 304, (
+            f'Проверьте, что `{url}` отвечает 304 для неизменённых данных'
+        )
+        assert response.content == b''
+
+    def test_title_detail(self, client, title):
+        url = f'/api/v1/titles/{title.id}/'
+        response = client.get(url)
+        assert response.status_code == 200
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        self.assert_not_modified(client, url, HTTP_IF_NONE_MATCH=etag)
+        self.assert_not_modified(
+            client, url, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+
+        title.description = 'Новое описание'
+        title.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200 and response['ETag'] != etag
+
+    def test_invalid_title_pk(self, client, title):
+        response = client.get('/api/v1/titles/abc/')
+        assert response.status_code == 404, (
+            'Проверьте, что нечисловой id произведения даёт 404'
+        )
+
+    def test_titles_list(self, client, titles):
+        url = '/api/v1/titles/?year=2001'
+        etag = client.get(url)['ETag']
+        self.assert_not_modified(client, url, HTTP_IF_NONE_MATCH=etag)
+        assert client.get(
+            '/api/v1/titles/?year=2002', HTTP_IF_NONE_MATCH=etag
+        ).status_code == 200, 'Проверьте, что ETag зависит от параметров'
+
+        titles[1].delete()
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == 200, (
+            'Проверьте, что удаление произведения меняет ETag списка'
+        )
+
+    def test_reviews_and_comments(self, client, title, user, user_client):
+        from reviews.models import Review
+
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=5
+        )
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        comments_url = f'{reviews_url}{review.id}/comments/'
+        reviews_etag = client.get(reviews_url)['ETag']
+        comments_etag = client.get(comments_url)['ETag']
+        self.assert_not_modified(
+            client, reviews_url, HTTP_IF_NONE_MATCH=reviews_etag
+        )
+        self.assert_not_modified(
+            client, comments_url, HTTP_IF_NONE_MATCH=comments_etag
+        )
+
+        user_client.post(comments_url, data={'text': 'Комментарий'})
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=comments_etag)
+        assert response.status_code == 200
+        assert len(response.json()['results']) == 1
+
+        user_client.patch(
+            f'{reviews_url}{review.id}/', data={'text': 'Исправленный'}
+        )
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=reviews_etag)
+        assert response.status_code == 200, (
+            'Проверьте, что изменение отзыва меняет ETag списка отзывов'
+        )
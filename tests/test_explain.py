@@ -0,0 +1,28 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class TestExplainQueries:
+
+    def test_explain_endpoints(self):
+        from django.db import connection
+
+        call_command('load_data', '--truncate')
+        out = StringIO()
+        options = ['--disable-seqscan'] if (
+            connection.vendor == 'postgresql'
+        ) else []
+        call_command('explain_queries', *options, verbosity=2, stdout=out)
+        output = out.getvalue()
+        assert 'comments-detail' in output, (
+            'Проверьте, что команда проверяет все эндпоинты'
+        )
+        for name in ('reviews-list', 'comments-list', 'titles-list',
+                     'titles-genre'):
+            section = output.split(f'{name}:')[1].split('GET', 2)[1]
+            assert 'Seq Scan' not in section, (
+                f'Проверьте, что запросы эндпоинта {name} используют индексы'
+            )
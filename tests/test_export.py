@@ -0,0 +1,102 @@
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.fixture
+def reviewed(titles, user, another_user):
+    from reviews.models import Comment, Review
+
+    for title in titles[:3]:
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв, "с кавычками"', score=8
+        )
+        Comment.objects.create(
+            review=review, author=another_user, text='Комментарий'
+        )
+    return titles
+
+
+def read(response):
+    assert response.streaming, 'Проверьте, что выгрузка отдаётся потоком'
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestExport:
+
+    def test_permissions(self, client, user_client, admin_client):
+        assert client.get('/api/v1/export/titles/').status_code == 401
+        assert user_client.get('/api/v1/export/titles/').status_code == 403
+        assert admin_client.get('/api/v1/export/users/').status_code == 404
+        assert admin_client.get(
+            '/api/v1/export/titles/?file_format=xml'
+        ).status_code == 400
+
+    def test_ndjson(self, admin_client, client, reviewed, settings):
+        settings.EXPORT_CHUNK_SIZE = 2
+        response = admin_client.get('/api/v1/export/titles/')
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = [json.loads(line) for line in read(response).splitlines()]
+        listed = client.get('/api/v1/titles/?page_size=100').json()
+        assert lines == sorted(
+            listed['results'], key=lambda item: item['id']
+        ), (
+            'Проверьте, что строки выгрузки совпадают с элементами списка '
+            'при чтении несколькими частями'
+        )
+        reviews = read(admin_client.get('/api/v1/export/reviews/'))
+        assert [
+            json.loads(line)['title'] for line in reviews.splitlines()
+        ] == [title.id for title in reviewed[:3]]
+
+    def test_csv(self, admin_client, reviewed):
+        response = admin_client.get(
+            '/api/v1/export/titles/?file_format=csv',
+            HTTP_ACCEPT='text/csv'
+        )
+        assert response.status_code == 200
+        assert response['Content-Disposition'] == (
+            'attachment; filename="titles.csv"'
+        )
+        rows = list(csv.DictReader(io.StringIO(read(response))))
+        assert len(rows) == 6
+        assert (rows[1]['category'], rows[1]['genre']) == (
+            'movie', 'comedy,drama'
+        ), 'Проверьте, что категория и жанры выгружаются своими slug'
+        reviews = list(csv.DictReader(io.StringIO(read(admin_client.get(
+            '/api/v1/export/reviews/?file_format=csv'
+        )))))
+        assert reviews[0]['text'] == 'Отзыв, "с кавычками"'
+
+    def test_command(self, reviewed, tmp_path):
+        output = tmp_path / 'comments.ndjson'
+        call_command(
+            'export_data', 'comments', '--output', str(output),
+            '--chunk-size', '1'
+        )
+        comments = [
+            json.loads(line) for line in output.read_text().splitlines()
+        ]
+        assert [comment['author'] for comment in comments] == [
+            'TestUserAnother'
+        ] * 3
+
+    def test_command_stdout(self, reviewed):
+        stdout = io.StringIO()
+        call_command('export_data', 'comments', stdout=stdout)
+        comments = [
+            json.loads(line) for line in stdout.getvalue().splitlines()
+        ]
+        assert len(comments) == 3, (
+            'Проверьте, что без --output выгрузка пишется в stdout команды'
+        )
+        stdout = io.StringIO()
+        call_command(
+            'export_data', 'reviews', '--format', 'csv', stdout=stdout
+        )
+        reviews = list(csv.DictReader(io.StringIO(stdout.getvalue())))
+        assert reviews[0]['text'] == 'Отзыв, "с кавычками"'
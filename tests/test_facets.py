@@ -0,0 +1,70 @@
+import pytest
+from django.core.management import call_command
+
+FACETS = '/api/v1/titles/facets/'
+
+
+def counts(facet):
+    return {item.get('slug', item.get('year')): item['count'] for item in facet}
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFacets:
+
+    def test_counts(self, client, titles):
+        response = client.get(FACETS)
+        assert response.status_code == 200
+        data = response.json()
+        assert data['count'] == 6
+        assert data['category'] == [
+            {'name': 'Фильм', 'slug': 'movie', 'count': 6}
+        ]
+        assert counts(data['genre']) == {'comedy': 3, 'drama': 6}
+        assert counts(data['year']) == {year: 1 for year in range(2000, 2006)}
+
+    def test_filters(self, client, titles):
+        data = client.get(FACETS + '?genre=comedy').json()
+        assert data['count'] == 3
+        assert counts(data['genre']) == {'comedy': 3, 'drama': 6}, (
+            'Проверьте, что фасет считается без собственного фильтра'
+        )
+        assert counts(data['year']) == {2001: 1, 2003: 1, 2005: 1}
+        assert counts(data['category']) == {'movie': 3}
+        data = client.get(FACETS + '?year=2001&name=Произведение').json()
+        assert data['count'] == 1
+        assert counts(data['genre']) == {'comedy': 1, 'drama': 1}
+        assert len(data['year']) == 6
+        assert client.get(FACETS + '?year=abc').status_code == 400
+
+    def test_cache(self, client, admin_client, user_client, titles):
+        assert client.get(FACETS)['X-Cache'] == 'MISS'
+        assert client.get(FACETS)['X-Cache'] == 'HIT'
+        user_client.post(
+            f'/api/v1/titles/{titles[0].id}/reviews/',
+            data={'text': 'Отзыв', 'score': 5}
+        )
+        assert client.get(FACETS)['X-Cache'] == 'HIT', (
+            'Проверьте, что отзывы не сбрасывают кэш фасетов'
+        )
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Новое', 'year': 2001, 'genre': ['comedy'],
+            'category': 'movie',
+        })
+        assert response.status_code == 201
+        response = client.get(FACETS)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что изменение произведений сбрасывает кэш фасетов'
+        )
+        data = response.json()
+        assert data['count'] == 7
+        assert counts(data['genre']) == {'comedy': 4, 'drama': 6}
+        assert counts(data['year'])[2001] == 2
+
+    def test_load_data(self, client, titles):
+        assert client.get(FACETS).json()['count'] == 6
+        call_command('load_data', '--truncate')
+        response = client.get(FACETS)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что load_data сбрасывает кэш фасетов'
+        )
+        assert response.json()['count'] == 32
@@ -0,0 +1,93 @@
+import pytest
+
+
+def get(client, path):
+    """Ответ и SQL запросов к произведениям."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(path)
+    assert response.status_code == 200
+    return response.json(), [query['sql'] for query in context]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFieldsets:
+
+    def test_list(self, client, titles):
+        full, full_queries = get(client, '/api/v1/titles/')
+        data, queries = get(client, '/api/v1/titles/?fields=id,name,rating')
+        assert [list(item) for item in data['results']] == [
+            ['id', 'rating', 'name']
+        ] * 5, 'Проверьте, что ?fields= оставляет только указанные поля'
+        assert [item['name'] for item in data['results']] == [
+            item['name'] for item in full['results']
+        ]
+        assert len(queries) == len(full_queries) - 1, (
+            'Проверьте, что жанры не загружаются без ?fields=genre'
+        )
+        assert not any('"description"' in sql for sql in queries), (
+            'Проверьте, что описание не выбирается без ?fields=description'
+        )
+        data, _ = get(client, '/api/v1/titles/?fields=id,name,rating,')
+        assert [list(item) for item in data['results']] == [
+            ['id', 'rating', 'name']
+        ] * 5, 'Проверьте, что пустые имена в ?fields= пропускаются'
+        data, _ = get(client, '/api/v1/titles/?fields=,')
+        assert data['results'] == full['results'], (
+            'Проверьте, что ?fields= без имён возвращает полное представление'
+        )
+
+    def test_expand(self, client, titles):
+        data, queries = get(
+            client, '/api/v1/titles/?fields=id,genre,category'
+        )
+        assert data['results'][0]['genre'] == ['drama']
+        assert data['results'][0]['category'] == 'movie'
+        assert not any('"reviews_category"."name"' in sql for sql in queries)
+        assert not any('"reviews_genre"."name"' in sql for sql in queries)
+        data, queries = get(
+            client, '/api/v1/titles/?fields=id,genre,category&expand=genre'
+        )
+        assert data['results'][1]['genre'] == [
+            {'name': 'Комедия', 'slug': 'comedy'},
+            {'name': 'Драма', 'slug': 'drama'},
+        ], 'Проверьте, что ?expand= разворачивает связи'
+        assert data['results'][1]['category'] == 'movie'
+
+    def test_detail(self, client, titles):
+        query = '?fields=id,name,genre,category&expand=category'
+        listed, list_queries = get(client, '/api/v1/titles/' + query)
+        data, queries = get(client, f'/api/v1/titles/{titles[1].id}/{query}')
+        assert data == listed['results'][1], (
+            'Проверьте, что ?fields= одинаково действует на список и объект'
+        )
+        data, queries = get(
+            client, f'/api/v1/titles/{titles[1].id}/?fields=id'
+        )
+        assert data == {'id': titles[1].id}
+        assert not any('genre' in sql for sql in queries)
+        assert not any('"description"' in sql for sql in queries)
+
+    def test_reviews(self, client, title, user):
+        from reviews.models import Review
+
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=7
+        )
+        path = f'/api/v1/titles/{title.id}/reviews/'
+        data, queries = get(client, path + '?fields=id,score')
+        assert data['results'] == [{'id': review.id, 'score': 7}]
+        data, queries = get(client, f'{path}{review.id}/?fields=author')
+        assert data == {'author': user.username}
+
+    def test_errors(self, client, title, titles):
+        for query in ('?fields=id,secret', '?fields=id&expand=rating'):
+            response = client.get('/api/v1/titles/' + query)
+            assert response.status_code == 400, (
+                'Проверьте, что неизвестные поля отклоняются'
+            )
+        response = client.get(f'/api/v1/titles/{title.id}/reviews/'
+                              '?fields=id&expand=author')
+        assert response.status_code == 400
@@ -0,0 +1,42 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class TestLoadData:
+
+    def test_load_data(self):
+        from reviews.models import Comment, GenreTitle, Review, Title
+
+        call_command('load_data', '--truncate', '--batch-size', '10')
+        assert Title.objects.count() == 32
+        assert GenreTitle.objects.count() == 42
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 3
+        assert Title.objects.get(pk=1).rating == 10, (
+            'Проверьте, что после загрузки пересчитываются рейтинги'
+        )
+
+        call_command('load_data')
+        assert Review.objects.count() == 72, (
+            'Проверьте, что повторная загрузка не дублирует записи'
+        )
+
+    def test_only_with_truncate(self):
+        from django.core.management import CommandError
+        from reviews.models import Genre, GenreTitle, Review, Title
+
+        call_command('load_data', '--truncate')
+        with pytest.raises(CommandError):
+            call_command('load_data', '--truncate', '--only', 'genre')
+        assert GenreTitle.objects.count() == 42, (
+            'Проверьте, что --truncate не очищает зависящие таблицы, '
+            'которых нет в --only'
+        )
+        call_command(
+            'load_data', '--truncate', '--only', 'genre', 'genretitle'
+        )
+        assert Genre.objects.count() == 15
+        assert GenreTitle.objects.count() == 42
+        assert Title.objects.count() == 32
+        assert Review.objects.count() == 72
@@ -0,0 +1,65 @@
+import json
+import logging
+
+import pytest
+
+
+@pytest.fixture
+def request_metrics():
+    from api import metrics
+
+    metrics.clear()
+    yield metrics
+    metrics.clear()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPerformanceMiddleware:
+
+    def test_histograms(self, admin_client, client, titles, request_metrics):
+        client.get('/api/v1/titles/')
+        client.get(f'/api/v1/titles/{titles[0].id}/')
+        response = admin_client.get('/api/v1/stats/metrics/')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        text = response.content.decode()
+        for line in (
+            'yamdb_request_duration_seconds_count{view="titles-list"} 1',
+            'yamdb_request_duration_seconds_count{view="titles-detail"} 1',
+            'yamdb_db_queries_bucket{view="titles-list",le="+Inf"} 1',
+            'yamdb_response_size_bytes_count{view="titles-detail"} 1',
+            'yamdb_cache_misses_total 1',
+        ):
+            assert line in text, (
+                f'Проверьте, что метрики содержат строку `{line}`'
+            )
+        serializer_sum = [
+            line for line in text.splitlines() if line.startswith(
+                'yamdb_serializer_duration_seconds_sum{view="titles-list"}'
+            )
+        ]
+        assert float(serializer_sum[0].split()[-1]) > 0, (
+            'Проверьте, что время сериализации учитывается'
+        )
+
+    def test_metrics_admin_only(self, user_client, client):
+        assert client.get('/api/v1/stats/metrics/').status_code == 401
+        assert user_client.get('/api/v1/stats/metrics/').status_code == 403
+
+    def test_server_timing_and_log(self, client, titles, settings, caplog):
+        response = client.get('/api/v1/titles/')
+        assert 'Server-Timing' not in response, (
+            'Проверьте, что заголовок Server-Timing выключен по умолчанию'
+        )
+        settings.SERVER_TIMING = True
+        with caplog.at_level(logging.INFO, logger='api.performance'):
+            response = client.get('/api/v1/genres/')
+        assert response['Server-Timing'].startswith('total;dur='), (
+            'Проверьте, что при SERVER_TIMING=True добавляется Server-Timing'
+        )
+        assert 'queries' in response['Server-Timing']
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record['view'] == 'genres-list'
+        assert record['status'] == 200
+        assert record['db_queries'] == 2
+        assert record['size'] == len(response.content)
@@ -0,0 +1,79 @@
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class TestOutbox:
+
+    def signup(self, client, username='new_user'):
+        response = client.post('/api/v1/auth/signup/', data={
+            'username': username, 'email': f'{username}@yamdb.fake'
+        })
+        assert response.status_code == 200
+        return response
+
+    def test_signup_enqueues_email(self, client, django_user_model):
+        from api.models import OutboxEmail
+
+        self.signup(client)
+        assert mail.outbox == [], (
+            'Проверьте, что регистрация не отправляет письмо в запросе'
+        )
+        email = OutboxEmail.objects.get()
+        user = django_user_model.objects.get(username='new_user')
+        assert email.to == 'new_user@yamdb.fake'
+        assert user.confirmation_code in email.body
+
+        call_command('send_emails')
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что команда send_emails отправляет письма из очереди'
+        )
+        assert mail.outbox[0].to == ['new_user@yamdb.fake']
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.SENT and email.sent_at
+
+        call_command('send_emails')
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что письмо не отправляется повторно'
+        )
+
+    def test_retry_with_backoff(self, client):
+        from api.models import OutboxEmail
+        from api.outbox import deliver_batch
+
+        self.signup(client, 'first')
+        self.signup(client, 'second')
+        with mock.patch(
+            'django.core.mail.EmailMessage.send',
+            side_effect=[OSError('timeout'), 1]
+        ):
+            sent, failed = deliver_batch(backoff=60)
+        assert len(sent) == 1 and len(failed) == 1
+        email = OutboxEmail.objects.get(to='first@yamdb.fake')
+        assert email.status == OutboxEmail.PENDING and email.attempts == 1
+        assert 'timeout' in email.last_error
+        assert email.next_attempt_at > email.created, (
+            'Проверьте, что повторная попытка откладывается'
+        )
+        assert deliver_batch() == ([], []), (
+            'Проверьте, что письмо не отправляется до истечения задержки'
+        )
+
+        OutboxEmail.objects.update(next_attempt_at=email.created)
+        with mock.patch(
+            'django.core.mail.EmailMessage.send', side_effect=OSError
+        ):
+            deliver_batch(max_attempts=2)
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.FAILED, (
+            'Проверьте, что после max_attempts письмо помечается неотправленным'
+        )
+
+    def test_metrics(self, client, admin_client):
+        self.signup(client)
+        text = admin_client.get('/api/v1/stats/metrics/').content.decode()
+        assert 'yamdb_outbox_pending 1' in text
+        assert 'yamdb_outbox_failed 0' in text
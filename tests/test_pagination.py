@@ -0,0 +1,78 @@
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class TestKeysetPagination:
+
+    def walk(self, client, url):
+        names, pages = [], 0
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200, (
+                f'Проверьте, что GET-запрос к `{url}` возвращает код 200'
+            )
+            data = response.json()
+            names.extend(item['name'] for item in data['results'])
+            url, pages = data['next'], pages + 1
+        return names, pages
+
+    def test_titles_cursor(self, client, titles):
+        from reviews.models import Title
+
+        Title.objects.create(name='Произведение 3', year=2001)
+        Title.objects.create(name='Произведение 3', year=2002)
+        response = client.get('/api/v1/titles/?pagination=cursor')
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что курсорная пагинация не считает количество записей'
+        )
+        names, pages = self.walk(
+            client, '/api/v1/titles/?pagination=cursor&page_size=2'
+        )
+        expected = list(
+            Title.objects.order_by('name', 'id').values_list('name', flat=True)
+        )
+        assert names == expected and pages == 4, (
+            'Проверьте, что курсорная пагинация обходит все произведения '
+            'в порядке (name, id) без пропусков и повторов'
+        )
+
+    def test_count_on_request(self, client, titles):
+        response = client.get('/api/v1/titles/?pagination=cursor&count=true')
+        assert response.json()['count'] == len(titles), (
+            'Проверьте, что параметр count=true добавляет количество записей'
+        )
+
+    def test_max_page_size(self, client, titles, settings, monkeypatch):
+        from api.pagination import KeysetPagination, PageSizePagination
+
+        assert KeysetPagination.max_page_size == settings.MAX_PAGE_SIZE
+        assert PageSizePagination.max_page_size == settings.MAX_PAGE_SIZE
+        max_page_size = len(titles) - 2
+        monkeypatch.setattr(KeysetPagination, 'max_page_size', max_page_size)
+        monkeypatch.setattr(
+            PageSizePagination, 'max_page_size', max_page_size
+        )
+        for url in ('/api/v1/titles/?page_size=100000',
+                    '/api/v1/titles/?pagination=cursor&page_size=100000'):
+            data = client.get(url).json()
+            assert len(data['results']) == max_page_size, (
+                'Проверьте, что размер страницы ограничен MAX_PAGE_SIZE'
+            )
+            assert data['next'] is not None
+
+    def test_page_number_is_default(self, client, titles):
+        data = client.get('/api/v1/titles/').json()
+        assert data['count'] == len(titles) and len(data['results']) == 5, (
+            'Проверьте, что без параметра pagination ответ не изменился'
+        )
+
+    def test_reviews_cursor_queries(self, client, title, user,
+                                    django_assert_num_queries):
+        from reviews.models import Review
+
+        Review.objects.create(title=title, author=user, text='1', score=5)
+        url = f'/api/v1/titles/{title.id}/reviews/?pagination=cursor'
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert len(response.json()['results']) == 1
@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def pooled_connection():
+    """Соединение через бэкенд api.db с пулом на одно соединение."""
+    from api.db import pool
+    from api.db.base import DatabaseWrapper
+    from django.db import connection
+
+    if connection.vendor != 'postgresql':
+        pytest.skip('Пул соединений доступен только на PostgreSQL')
+    wrapper = DatabaseWrapper(dict(connection.settings_dict, POOL={
+        'MAX_SIZE': 1, 'TIMEOUT': 0.2, 'CHECK_INTERVAL': 0,
+    }), alias='pooled')
+    yield wrapper
+    wrapper.close()
+    pool.close_all()
+
+
+def backend_pid(wrapper):
+    with wrapper.cursor() as cursor:
+        cursor.execute('SELECT pg_backend_pid()')
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConnectionPool:
+
+    def test_reuse(self, pooled_connection):
+        pid = backend_pid(pooled_connection)
+        pooled_connection.close()
+        assert backend_pid(pooled_connection) == pid, (
+            'Проверьте, что закрытое соединение возвращается в пул'
+        )
+        assert pooled_connection.pool.get_stats()['size'] == 1
+
+    def test_rollback_on_release(self, pooled_connection):
+        from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+        pooled_connection.set_autocommit(False)
+        backend_pid(pooled_connection)
+        pooled_connection.close()
+        connection, waited = pooled_connection.pool.getconn()
+        assert connection.autocommit, (
+            'Проверьте, что соединения в пуле хранятся в режиме autocommit'
+        )
+        assert connection.get_transaction_status() == (
+            TRANSACTION_STATUS_IDLE
+        ), 'Проверьте, что незавершённая транзакция откатывается'
+        pooled_connection.pool.putconn(connection)
+
+    def test_timeout(self, pooled_connection):
+        from api.db.base import DatabaseWrapper
+        from django.db import OperationalError
+
+        backend_pid(pooled_connection)
+        errors = []
+
+        def acquire():
+            other = DatabaseWrapper(
+                pooled_connection.settings_dict, alias='pooled'
+            )
+            try:
+                other.ensure_connection()
+            except OperationalError as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        thread.join()
+        assert errors, (
+            'Проверьте, что при исчерпании пула ожидание ограничено TIMEOUT'
+        )
+        assert pooled_connection.pool.get_stats()['timeouts'] == 1
+
+    def test_health_check(self, pooled_connection):
+        pid = backend_pid(pooled_connection)
+        pooled_connection.close()
+        connection, waited = pooled_connection.pool.getconn()
+        connection.close()
+        pooled_connection.pool.putconn(connection)
+        assert backend_pid(pooled_connection) != pid, (
+            'Проверьте, что разорванное соединение заменяется новым'
+        )
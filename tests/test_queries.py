@@ -0,0 +1,112 @@
+import pytest
+
+
+@pytest.fixture
+def reviews(titles, django_user_model):
+    from reviews.models import Comment, Review
+
+    title = titles[0]
+    result = []
+    for index in range(4):
+        author = django_user_model.objects.create_user(
+            username=f'author{index}', email=f'author{index}@yamdb.fake'
+        )
+        review = Review.objects.create(
+            title=title, author=author, text=f'Отзыв {index}', score=index + 1
+        )
+        Comment.objects.create(review=review, author=author, text='Коммент')
+        Comment.objects.create(review=review, author=author, text='Ещё')
+        result.append(review)
+    return result
+
+
+@pytest.mark.django_db(transaction=True)
+class TestQueryCount:
+    """Количество запросов не должно зависеть от размера страницы."""
+
+    def check(self, client, url, expected, django_assert_num_queries):
+        with django_assert_num_queries(expected):
+            response = client.get(url)
+        assert response.status_code == 200, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает код 200'
+        )
+
+    def test_titles(self, client, titles, django_assert_num_queries):
+        self.check(client, '/api/v1/titles/', 3, django_assert_num_queries)
+        self.check(
+            client, f'/api/v1/titles/{titles[0].id}/', 3,
+            django_assert_num_queries
+        )
+        self.check(
+            client, '/api/v1/titles/?genre=drama', 3,
+            django_assert_num_queries
+        )
+
+    def test_categories_and_genres(self, client, titles,
+                                   django_assert_num_queries):
+        self.check(client, '/api/v1/categories/', 2, django_assert_num_queries)
+        self.check(client, '/api/v1/genres/', 2, django_assert_num_queries)
+
+    def test_reviews(self, client, reviews, django_assert_num_queries):
+        title_id = reviews[0].title_id
+        self.check(
+            client, f'/api/v1/titles/{title_id}/reviews/', 3,
+            django_assert_num_queries
+        )
+        self.check(
+            client, f'/api/v1/titles/{title_id}/reviews/{reviews[0].id}/', 2,
+            django_assert_num_queries
+        )
+
+    def test_comments(self, client, reviews, django_assert_num_queries):
+        review = reviews[0]
+        self.check(
+            client,
+            f'/api/v1/titles/{review.title_id}/reviews/{review.id}/comments/',
+            3, django_assert_num_queries
+        )
+
+    def test_create_review(self, user_client, title):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        data = {'text': 'Отзыв', 'score': 7}
+        # Состояние пользователя для проверки токена кэшируется.
+        user_client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data=data)
+        assert response.status_code == 201
+        queries = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].split()[0] in ('SELECT', 'INSERT', 'UPDATE')
+        ]
+        # Произведение, вставка отзыва, пересчёт рейтинга и автор для
+        # ответа: пользователь из токена не загружается, отдельной
+        # проверки на повторный отзыв нет.
+        assert len(queries) == 4, (
+            'Проверьте, что создание отзыва не выполняет лишних запросов'
+        )
+        response = user_client.post(url, data=data)
+        assert response.status_code == 400, (
+            'Проверьте, что повторный отзыв на произведение запрещён'
+        )
+        assert response.json() == {
+            'non_field_errors': ['Вы уже оставили отзыв на этот обзор.']
+        }
+
+    def test_create_review_other_integrity_error(
+        self, user_client, title, monkeypatch
+    ):
+        from api.serializers import ReviewSerializer
+        from django.db import IntegrityError
+
+        def create(serializer, validated_data):
+            raise IntegrityError('violates check constraint')
+
+        monkeypatch.setattr(ReviewSerializer, 'create', create)
+        with pytest.raises(IntegrityError):
+            user_client.post(
+                f'/api/v1/titles/{title.id}/reviews/',
+                data={'text': 'Отзыв', 'score': 7}
+            )
@@ -0,0 +1,84 @@
+import datetime
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.fixture
+def ranked(titles, user, another_user, admin):
+    """Три отзыва с оценкой 9, один с 10 и один старый с оценкой 2."""
+    from django.utils import timezone
+    from reviews.models import Review
+
+    Review.objects.create(title=titles[0], author=user, text='Отзыв', score=10)
+    for author in (user, another_user, admin):
+        Review.objects.create(
+            title=titles[1], author=author, text='Отзыв', score=9
+        )
+    old = Review.objects.create(
+        title=titles[2], author=user, text='Отзыв', score=2
+    )
+    Review.objects.filter(pk=old.pk).update(
+        pub_date=timezone.now() - datetime.timedelta(days=30)
+    )
+    call_command('refresh_rankings')
+    return titles
+
+
+def get_ids(client, path):
+    response = client.get(path)
+    assert response.status_code == 200
+    return [item['id'] for item in response.json()]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestRankings:
+
+    def test_refresh(self, ranked):
+        from reviews.models import TitleRanking
+
+        rankings = {
+            ranking.title_id: ranking for ranking in TitleRanking.objects.all()
+        }
+        assert set(rankings) == {title.id for title in ranked[:3]}, (
+            'Проверьте, что рейтинги считаются только для произведений '
+            'с отзывами'
+        )
+        # Средний балл каталога 7.8, к оценке добавляются 10 таких отзывов.
+        assert rankings[ranked[0].id].score == pytest.approx(88 / 11)
+        assert rankings[ranked[1].id].score == pytest.approx(105 / 13)
+        assert [rankings[title.id].velocity for title in ranked[:3]] == [
+            1, 3, 0
+        ]
+
+    def test_top(self, client, ranked):
+        assert get_ids(client, '/api/v1/titles/top/') == [
+            ranked[1].id, ranked[0].id, ranked[2].id
+        ], (
+            'Проверьте, что titles/top/ упорядочен по взвешенной оценке, '
+            'а единственная высокая оценка не выводит произведение вперёд'
+        )
+        assert get_ids(client, '/api/v1/titles/top/?limit=1') == [
+            ranked[1].id
+        ]
+        response = client.get('/api/v1/titles/top/?limit=1')
+        assert response.json() == client.get(
+            f'/api/v1/titles/?name={ranked[1].name}'
+        ).json()['results'], (
+            'Проверьте, что элементы titles/top/ совпадают с элементами '
+            'списка произведений'
+        )
+
+    def test_trending(self, client, ranked):
+        assert get_ids(client, '/api/v1/titles/trending/') == [
+            ranked[1].id, ranked[0].id
+        ], 'Проверьте, что titles/trending/ учитывает только недавние отзывы'
+
+    def test_filters(self, client, ranked):
+        assert get_ids(client, '/api/v1/titles/top/?genre=comedy') == [
+            ranked[1].id
+        ]
+        assert get_ids(client, '/api/v1/titles/trending/?category=movie') == [
+            ranked[1].id, ranked[0].id
+        ]
+        assert get_ids(client, '/api/v1/titles/top/?category=book') == []
@@ -0,0 +1,67 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTitleRating:
+
+    def test_rating_follows_reviews(self, title, user, another_user):
+        from reviews.models import Review
+
+        first = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=10
+        )
+        Review.objects.create(
+            title=title, author=another_user, text='Отзыв', score=5
+        )
+        title.refresh_from_db()
+        assert (title.rating, title.reviews_count, title.score_sum) == (
+            7, 2, 15
+        ), 'Проверьте, что рейтинг пересчитывается при создании отзыва'
+
+        first.score = 1
+        first.save()
+        title.refresh_from_db()
+        assert (title.rating, title.reviews_count, title.score_sum) == (
+            3, 2, 6
+        ), 'Проверьте, что рейтинг пересчитывается при изменении оценки'
+
+        first.delete()
+        title.refresh_from_db()
+        assert (title.rating, title.reviews_count, title.score_sum) == (
+            5, 1, 5
+        ), 'Проверьте, что рейтинг пересчитывается при удалении отзыва'
+
+        another_user.delete()
+        title.refresh_from_db()
+        assert (title.rating, title.reviews_count, title.score_sum) == (
+            None, 0, 0
+        ), 'Проверьте, что у произведения без отзывов рейтинг равен None'
+
+    def test_rating_in_api(self, client, title, user_client):
+        response = user_client.post(
+            f'/api/v1/titles/{title.id}/reviews/',
+            data={'text': 'Отзыв', 'score': 8}
+        )
+        assert response.status_code == 201
+        response = client.get(f'/api/v1/titles/{title.id}/')
+        data = response.json()
+        assert data['rating'] == 8, (
+            'Проверьте, что рейтинг произведения отдаётся из поля `rating`'
+        )
+        assert 'reviews_count' not in data and 'score_sum' not in data, (
+            'Проверьте, что служебные агрегаты не попадают в ответ API'
+        )
+
+    def test_rebuild_ratings_command(self, title, user):
+        from reviews.models import Review, Title
+
+        Review.objects.bulk_create([
+            Review(title=title, author=user, text='Отзыв', score=9)
+        ])
+        Title.objects.update(rating=None, reviews_count=0, score_sum=0)
+        call_command('rebuild_ratings')
+        title.refresh_from_db()
+        assert (title.rating, title.reviews_count, title.score_sum) == (
+            9, 1, 9
+        ), 'Проверьте, что команда rebuild_ratings восстанавливает агрегаты'
@@ -0,0 +1,70 @@
+import datetime
+import decimal
+import io
+import uuid
+
+import pytest
+
+
+def sample_data():
+    from django.utils.translation import gettext_lazy
+    from rest_framework.utils.serializer_helpers import ReturnDict
+
+    return ReturnDict({
+        'id': 1,
+        'name': 'Произведение\u2028с разделителем строк',
+        'rating': decimal.Decimal('7.50'),
+        'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'created': datetime.datetime(
+            2022, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc
+        ),
+        'date': datetime.date(2022, 1, 2),
+        'duration': datetime.timedelta(minutes=90),
+        'message': gettext_lazy('Not found.'),
+        'genre': [{'name': 'Драма', 'slug': 'drama'}],
+        'empty': None,
+    }, serializer=None)
+
+
+class TestFastJSON:
+
+    def test_same_bytes(self):
+        from api.renderers import FastJSONRenderer
+        from rest_framework.renderers import JSONRenderer
+
+        data = sample_data()
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(
+            data
+        ), 'Проверьте, что FastJSONRenderer совпадает с JSONRenderer побайтно'
+        assert b'\\u2028' in FastJSONRenderer().render(data)
+
+    def test_indent(self):
+        from api.renderers import FastJSONRenderer
+        from rest_framework.renderers import JSONRenderer
+
+        data = sample_data()
+        media_type = 'application/json; indent=4'
+        assert FastJSONRenderer().render(data, media_type) == (
+            JSONRenderer().render(data, media_type)
+        )
+
+    def test_without_orjson(self, monkeypatch):
+        from api import parsers, renderers
+
+        monkeypatch.setattr(renderers, 'orjson', None)
+        monkeypatch.setattr(parsers, 'orjson', None)
+        rendered = renderers.FastJSONRenderer().render({'name': 'Драма'})
+        assert rendered == '{"name":"Драма"}'.encode()
+        assert parsers.FastJSONParser().parse(io.BytesIO(rendered)) == {
+            'name': 'Драма'
+        }, 'Проверьте, что без orjson работает стандартный парсер'
+
+    def test_parse_error(self):
+        from api.parsers import FastJSONParser
+        from rest_framework.exceptions import ParseError
+
+        assert FastJSONParser().parse(io.BytesIO(b'{"score": 10}')) == {
+            'score': 10
+        }
+        with pytest.raises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"score": }'))
@@ -0,0 +1,94 @@
+import pytest
+
+
+@pytest.fixture
+def add_replica(settings):
+    """Подключает реплику — второе соединение с тестовой базой."""
+    from api import replicas
+    from django.db import connections
+
+    aliases = []
+
+    def add(alias, **overrides):
+        connections.databases[alias] = dict(
+            connections['default'].settings_dict, **overrides
+        )
+        aliases.append(alias)
+        settings.REPLICA_DATABASES = aliases
+        return connections[alias]
+
+    yield add
+    replicas.unavailable.clear()
+    for alias in aliases:
+        connections[alias].close()
+        delattr(connections._connections, alias)
+        del connections.databases[alias]
+
+
+def count_queries(connection, client_call):
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as context:
+        response = client_call()
+    assert response.status_code < 400
+    return len(context)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReplicaRouting:
+
+    def test_reads_from_replica(self, client, title, add_replica):
+        from django.db import connection
+
+        replica = add_replica('replica')
+        path = f'/api/v1/titles/{title.id}/reviews/'
+        assert count_queries(connection, lambda: client.get(path)) == 0, (
+            'Проверьте, что чтение выполняется на реплике'
+        )
+        assert count_queries(replica, lambda: client.get(path)) > 0
+
+    def test_read_your_writes(self, client, user_client, title, add_replica):
+        from django.db import connection
+
+        replica = add_replica('replica')
+        path = f'/api/v1/titles/{title.id}/reviews/'
+        assert count_queries(connection, lambda: user_client.post(
+            path, data={'text': 'Отзыв', 'score': 5}
+        )) > 0
+        assert count_queries(replica, lambda: user_client.get(path)) == 0, (
+            'Проверьте, что после записи пользователь читает основную базу'
+        )
+        assert count_queries(connection, lambda: client.get(path)) == 0, (
+            'Проверьте, что остальные клиенты читают реплику'
+        )
+
+    def test_unavailable_replica(self, client, title, add_replica):
+        from api import replicas
+
+        add_replica('replica', NAME='/nonexistent/replica.sqlite3')
+        response = client.get(f'/api/v1/titles/{title.id}/')
+        assert response.status_code == 200, (
+            'Проверьте, что при недоступной реплике чтение идёт в основную базу'
+        )
+        assert 'replica' in replicas.unavailable
+
+
+class TestReplicaSettings:
+
+    def test_replicas_require_redis(self):
+        import os
+        import subprocess
+        import sys
+        from os.path import abspath, dirname, join
+
+        env = dict(os.environ, DB_REPLICAS='replica:5432')
+        env.pop('REDIS_URL', None)
+        result = subprocess.run(
+            [sys.executable, '-c', 'import api_yamdb.settings'],
+            cwd=join(dirname(dirname(abspath(__file__))), 'api_yamdb'),
+            env=env, capture_output=True, text=True
+        )
+        assert result.returncode != 0, (
+            'Проверьте, что DB_REPLICAS без REDIS_URL отклоняется'
+        )
+        assert 'REDIS_URL' in result.stderr
@@ -15,3 +15,4 @@ class TestRequirements:
         assert 'gunicorn' in requirements, 'Проверьте, что добавили gunicorn в файл requirements.txt'
         assert 'django' in requirements, 'Проверьте, что добавили django в файл requirements.txt'
         assert 'pytest-django' in requirements, 'Проверьте, что добавили pytest-django в файл requirements.txt'
+        assert 'django-redis' in requirements, 'Проверьте, что добавили django-redis в файл requirements.txt'
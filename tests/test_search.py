@@ -0,0 +1,70 @@
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTitleSearch:
+
+    def search(self, client, query):
+        response = client.get('/api/v1/titles/', {'search': query})
+        assert response.status_code == 200, (
+            'Проверьте, что GET-запрос к `/api/v1/titles/?search=` '
+            'возвращает код 200'
+        )
+        return [item['name'] for item in response.json()['results']]
+
+    def test_search_name_and_description(self, client, category):
+        from reviews.models import Title
+
+        Title.objects.create(
+            name='Побег из Шоушенка', year=1994, category=category,
+            description='Тюремная драма'
+        )
+        Title.objects.create(
+            name='Зелёная миля', year=1999, category=category,
+            description='Фэнтези и драма по роману Стивена Кинга'
+        )
+        Title.objects.create(name='Шоушенк', year=2000, category=category)
+        assert self.search(client, 'Побег') == ['Побег из Шоушенка'], (
+            'Проверьте, что поиск находит произведение по названию'
+        )
+        assert set(self.search(client, 'драма')) == {
+            'Побег из Шоушенка', 'Зелёная миля'
+        }, 'Проверьте, что поиск находит произведение по описанию'
+        response = client.get('/api/v1/titles/', {'search': 'драма'})
+        assert 'search_vector' not in response.json()['results'][0], (
+            'Проверьте, что поисковый вектор не попадает в ответ'
+        )
+
+    def test_search_with_filters(self, client, category, titles):
+        from reviews.models import Title
+
+        Title.objects.create(
+            name='Другое произведение', year=1990, description='Описание'
+        )
+        response = client.get(
+            '/api/v1/titles/', {'search': 'Описание', 'category': 'movie'}
+        )
+        assert response.json()['count'] == len(titles), (
+            'Проверьте, что поиск сочетается с остальными фильтрами'
+        )
+
+    def test_ranking(self, client, category):
+        from django.db import connection
+        from reviews.models import Title
+
+        if connection.vendor != 'postgresql':
+            pytest.skip('Ранжирование доступно только на PostgreSQL')
+        Title.objects.create(
+            name='Альфа', year=2000, category=category,
+            description='Фильм о космосе'
+        )
+        Title.objects.create(name='Космос', year=2000, category=category)
+        assert self.search(client, 'космос') == ['Космос', 'Альфа'], (
+            'Проверьте, что совпадения в названии выше совпадений в описании'
+        )
+        title = Title.objects.get(name='Альфа')
+        title.name = 'Космос и время'
+        title.save()
+        assert self.search(client, 'время') == ['Космос и время'], (
+            'Проверьте, что поисковый вектор обновляется при изменении'
+        )
@@ -0,0 +1,115 @@
+import pytest
+
+
+@pytest.fixture
+def rates(settings):
+    def set_rates(**rates):
+        settings.REST_FRAMEWORK = dict(
+            settings.REST_FRAMEWORK, DEFAULT_THROTTLE_RATES=rates
+        )
+    return set_rates
+
+
+@pytest.fixture
+def throttled(settings):
+    from api import throttling
+
+    throttling.rejected.clear()
+    yield throttling.rejected
+    throttling.rejected.clear()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestThrottling:
+
+    def test_auth(self, client, admin_client, rates, throttled):
+        rates(auth='3/min')
+        for number in range(3):
+            response = client.post('/api/v1/auth/signup/', data={})
+            assert response.status_code == 400
+        response = client.post('/api/v1/auth/token/', data={})
+        assert response.status_code == 429, (
+            'Проверьте, что регистрация и выдача токенов ограничены '
+            'общим лимитом auth'
+        )
+        assert int(response['Retry-After']) > 0
+        assert throttled['auth'] == 1
+        metrics = admin_client.get('/api/v1/stats/metrics/').content.decode()
+        assert 'yamdb_throttled_requests_total{scope="auth"} 1' in metrics
+
+    def test_anon_read(self, client, user_client, rates, throttled):
+        rates(anon_read='2/min')
+        for number in range(2):
+            assert client.get('/api/v1/genres/').status_code == 200
+        assert client.get('/api/v1/categories/').status_code == 429, (
+            'Проверьте, что чтение анонимными клиентами ограничено'
+        )
+        assert user_client.get('/api/v1/genres/').status_code == 200, (
+            'Проверьте, что лимит anon_read не действует на пользователей'
+        )
+
+    def test_spoofed_forwarded_for(self, client, rates, settings):
+        rates(anon_read='2/min')
+        statuses = [
+            client.get(
+                '/api/v1/genres/', HTTP_X_FORWARDED_FOR=f'10.0.0.{number}'
+            ).status_code
+            for number in range(4)
+        ]
+        assert statuses == [200, 200, 429, 429], (
+            'Проверьте, что без NUM_PROXIES заголовок X-Forwarded-For '
+            'не влияет на лимит'
+        )
+        settings.REST_FRAMEWORK = dict(settings.REST_FRAMEWORK, NUM_PROXIES=1)
+        statuses = [
+            client.get(
+                '/api/v1/genres/',
+                HTTP_X_FORWARDED_FOR=f'10.0.1.{number}, 192.0.2.1'
+            ).status_code
+            for number in range(4)
+        ]
+        assert statuses == [200, 200, 429, 429], (
+            'Проверьте, что за прокси лимит считается по адресу, '
+            'добавленному прокси'
+        )
+
+    def test_user_write(self, user_client, titles, rates, throttled):
+        rates(user_write='1/min')
+        response = user_client.post(
+            f'/api/v1/titles/{titles[0].id}/reviews/',
+            data={'text': 'Отзыв', 'score': 5}
+        )
+        assert response.status_code == 201
+        response = user_client.post(
+            f'/api/v1/titles/{titles[1].id}/reviews/',
+            data={'text': 'Отзыв', 'score': 5}
+        )
+        assert response.status_code == 429, (
+            'Проверьте, что запись пользователем ограничена'
+        )
+        assert user_client.get('/api/v1/genres/').status_code == 200
+
+    def test_sliding_window(self, rates):
+        from api.throttling import AuthRateThrottle
+        from rest_framework.test import APIRequestFactory
+
+        rates(auth='10/min')
+        request = APIRequestFactory().post('/api/v1/auth/token/')
+        now = [30]
+
+        def allowed(count):
+            results = []
+            for number in range(count):
+                throttle = AuthRateThrottle()
+                throttle.timer = lambda: now[0]
+                results.append(throttle.allow_request(request, None))
+            return results.count(True)
+
+        assert allowed(12) == 10
+        now[0] = 75
+        assert allowed(5) == 3, (
+            'Проверьте, что запросы предыдущего окна учитываются '
+            'пропорционально его доле в скользящем окне'
+        )
+        now[0] = 185
+        assert allowed(12) == 10
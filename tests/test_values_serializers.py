@@ -0,0 +1,88 @@
+import pytest
+
+
+@pytest.fixture
+def catalogue(titles, genres, django_user_model):
+    """Произведения без категории, отзывы и комментарии нескольких авторов."""
+    from reviews.models import Comment, Review, Title
+
+    empty = Title.objects.create(name='Без категории', year=1990)
+    empty.genre.set(reversed(genres))
+    authors = [
+        django_user_model.objects.create_user(
+            username=f'author{index}', email=f'author{index}@yamdb.fake'
+        )
+        for index in range(3)
+    ]
+    for title in titles[:2] + [empty]:
+        for index, author in enumerate(authors):
+            review = Review.objects.create(
+                title=title, author=author, score=index + 5,
+                text=f'Отзыв {index} «{title.name}»'
+            )
+            for other in authors:
+                Comment.objects.create(
+                    review=review, author=other, text=f'Комментарий {other}'
+                )
+    return titles[0], Review.objects.filter(title=titles[0]).first()
+
+
+def get_both(client, path):
+    """Ответы и число запросов с быстрым и обычным сериализатором."""
+    from api.views import CommentViewSet, ReviewViewSet, TitleViewSet
+    from django.core.cache import caches
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    results = []
+    for lean in (True, False):
+        for cache in caches.all():
+            cache.clear()
+        saved = {}
+        for viewset in (TitleViewSet, ReviewViewSet, CommentViewSet):
+            saved[viewset] = viewset.values_serializer_class
+            if not lean:
+                viewset.values_serializer_class = None
+        try:
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(path)
+        finally:
+            for viewset, serializer_class in saved.items():
+                viewset.values_serializer_class = serializer_class
+        assert response.status_code == 200
+        results.append((response.content, len(context)))
+    return results
+
+
+@pytest.mark.django_db(transaction=True)
+class TestValuesSerializers:
+
+    @pytest.mark.parametrize('query', [
+        '', '?page_size=100', '?page=2', '?pagination=cursor&page_size=3',
+        '?genre=drama', '?category=movie&year=2001', '?search=произведение',
+    ])
+    def test_titles(self, client, catalogue, query):
+        (lean, lean_queries), (model, model_queries) = get_both(
+            client, f'/api/v1/titles/{query}'
+        )
+        assert lean == model, (
+            'Проверьте, что список произведений совпадает побайтно'
+        )
+        assert lean_queries <= model_queries
+
+    @pytest.mark.parametrize('query', [
+        '', '?page_size=100', '?pagination=cursor&page_size=2',
+    ])
+    def test_reviews_and_comments(self, client, catalogue, query):
+        title, review = catalogue
+        for path in (
+            f'/api/v1/titles/{title.id}/reviews/',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+        ):
+            (lean, lean_queries), (model, model_queries) = get_both(
+                client, path + query
+            )
+            assert lean == model, (
+                f'Проверьте, что {path} совпадает побайтно'
+            )
+            assert lean_queries <= model_queries